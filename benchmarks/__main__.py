@@ -0,0 +1,208 @@
+import argparse
+import datetime
+import itertools
+import json
+import os
+import pathlib
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, List, Optional
+
+from benchmarks.fixtures import generate_configs, glitch_stand_in
+from scripts.accounts import DatabaseBackend, DatabaseTarget, build_accounts, connect, provision
+from scripts.ai_names import sample_ai_names
+from scripts.config import ConfigFile, dump_configs, parse_config_text
+from scripts.name_generator import NameIndex, generate_bot_names
+from scripts.names import GlitchNameFetcher
+from scripts.types import ServerConfig
+from scripts.validation import validate_configs
+
+SUITES = ['config', 'names', 'accounts']
+
+
+def measure(run: Callable[[Any], Any], repeats: int, setup: Optional[Callable[[], Any]] = None) -> List[float]:
+    # Only time the run itself, anything it needs to start from a clean state is prepared by setup
+    timings = []
+    for _ in range(repeats):
+        prepared = setup() if setup is not None else None
+        start = time.perf_counter()
+        run(prepared)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def take(names: Any, count: int) -> List[str]:
+    return list(itertools.islice(names, count))
+
+
+def create_account_database(path: pathlib.Path) -> DatabaseTarget:
+    if path.exists():
+        path.unlink()
+    target = DatabaseTarget(DatabaseBackend.SQLite, str(path))
+    store = connect(target)
+    try:
+        store.cursor.execute('CREATE TABLE accounts (id INTEGER PRIMARY KEY, name TEXT UNIQUE, password TEXT, '
+                             'email TEXT, country TEXT)')
+        store.connection.commit()
+    finally:
+        store.close()
+    return target
+
+
+def run_provisioning(target: DatabaseTarget, accounts: list, batch_size: int, bulk_load: bool) -> None:
+    store = connect(target, bulk_load)
+    try:
+        result = provision(store, accounts, batch_size, bulk_load)
+    finally:
+        store.close()
+    if result.failed > 0:
+        raise Exception(f'Failed to provision {result.failed} accounts')
+
+
+def get_git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=pathlib.Path(__file__).parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+parser = argparse.ArgumentParser(description='Benchmark config, name and account tooling against synthetic fleets of '
+                                             'different sizes')
+parser.add_argument('--sizes', help='Number of bots in each synthetic fleet to benchmark', type=int, nargs='+',
+                    default=[4, 100, 1000, 10000])
+parser.add_argument('--suite', help='Suite(s) of benchmarks to run', choices=SUITES, nargs='+', default=SUITES)
+parser.add_argument('--repeats', help='Number of times to run each benchmark', type=int, default=5)
+parser.add_argument('--batch-size', help='Number of accounts to write per transaction when provisioning', type=int,
+                    default=1000)
+parser.add_argument('--glitch-concurrency', help='Number of requests to the glitch API stand-in to keep in flight',
+                    type=int, default=4)
+parser.add_argument('--output', help='Path to write results to as JSON', type=str)
+parser.add_argument('--json', help='Print results as JSON', action='store_true')
+args = parser.parse_args()
+
+if args.repeats < 1 or any(size < 1 for size in args.sizes):
+    parser.error('sizes and repeats must be positive')
+
+results: List[dict] = []
+
+
+def record(benchmark: str, configs: List[ServerConfig], items: int, timings: List[float]) -> None:
+    best = min(timings)
+    entry = {
+        'benchmark': benchmark,
+        'bots': sum(len(config.bots) for config in configs),
+        'servers': len(configs),
+        'items': items,
+        'repeats': len(timings),
+        'min': best,
+        'median': statistics.median(timings),
+        'max': max(timings),
+        'rate': items / best if best > 0 else None
+    }
+    results.append(entry)
+
+    if not args.json:
+        print(f'{benchmark:<28} {entry["bots"]:>6} bots  {best * 1000:>10.2f} ms min  '
+              f'{entry["median"] * 1000:>10.2f} ms median  {entry["rate"] or 0:>12,.0f} items/s')
+
+
+with tempfile.TemporaryDirectory() as tempDir:
+    workDir = pathlib.Path(tempDir)
+    # Keep parsed config caches out of the user's cache dir
+    os.environ['XDG_CACHE_HOME'] = str(workDir.joinpath('cache'))
+
+    with glitch_stand_in() as glitchUrl:
+        for size in args.sizes:
+            configs = generate_configs(size)
+            bots = [bot for config in configs for bot in config.bots]
+
+            if 'config' in args.suite:
+                dumped = [config.dump() for config in configs]
+                record('config.dump', configs, len(configs), measure(lambda _: [c.dump() for c in configs],
+                                                                     args.repeats))
+                record('config.load', configs, len(configs),
+                       measure(lambda _: [ServerConfig.load(data) for data in dumped], args.repeats))
+
+                configPath = workDir.joinpath(f'config-{size}.yaml')
+                dump_configs(configs, configPath, use_cache=False)
+                text = configPath.read_text()
+                record('config.parse', configs, len(configs), measure(lambda _: parse_config_text(text), args.repeats))
+                record('config.read', configs, len(configs),
+                       measure(lambda _: ConfigFile.load(configPath, use_cache=False), args.repeats))
+                # Populate the cache once, so every timed run is a cache hit
+                ConfigFile.load(configPath, use_cache=True)
+                record('config.read-cached', configs, len(configs),
+                       measure(lambda _: ConfigFile.load(configPath, use_cache=True), args.repeats))
+
+                def change_password() -> ConfigFile:
+                    configFile = ConfigFile.load(configPath, use_cache=False)
+                    configFile.configs[-1].bots[-1].password = os.urandom(5).hex()
+                    return configFile
+
+                # Saving after changing a single bot only re-serializes that bot's server
+                record('config.save-incremental', configs, len(configs),
+                       measure(lambda configFile: configFile.save(use_cache=False), args.repeats, change_password))
+                record('config.validate', configs, len(bots),
+                       measure(lambda _: validate_configs(configs, dumped, overpopulate_factor=2), args.repeats))
+
+            if 'names' in args.suite:
+                record('names.generated', configs, size,
+                       measure(lambda _: take(generate_bot_names(NameIndex(set(), size)), size), args.repeats))
+                # The AI name corpus is finite, so take as many as it holds at most
+                aiNames = len(take(sample_ai_names(set()), size))
+                record('names.ai', configs, aiNames,
+                       measure(lambda _: take(sample_ai_names(set()), size), args.repeats))
+
+                def fetch_glitch_names(fetcher: GlitchNameFetcher) -> None:
+                    names = fetcher.names()
+                    try:
+                        take(names, size)
+                    finally:
+                        names.close()
+
+                record('names.glitch', configs, size,
+                       measure(fetch_glitch_names, args.repeats,
+                               lambda: GlitchNameFetcher(glitchUrl, args.glitch_concurrency)))
+
+            if 'accounts' in args.suite:
+                accounts = build_accounts(configs)
+                record('accounts.build', configs, len(accounts),
+                       measure(lambda _: build_accounts(configs), args.repeats))
+
+                databasePath = workDir.joinpath(f'accounts-{size}.db')
+                record('accounts.provision', configs, len(accounts),
+                       measure(lambda target: run_provisioning(target, accounts, args.batch_size, False),
+                               args.repeats, lambda: create_account_database(databasePath)))
+                record('accounts.provision-bulk', configs, len(accounts),
+                       measure(lambda target: run_provisioning(target, accounts, args.batch_size, True),
+                               args.repeats, lambda: create_account_database(databasePath)))
+                # Re-running against a fully provisioned database should only look up the existing names
+                target = create_account_database(databasePath)
+                run_provisioning(target, accounts, args.batch_size, False)
+                record('accounts.provision-existing', configs, len(accounts),
+                       measure(lambda _: run_provisioning(target, accounts, args.batch_size, False), args.repeats))
+
+output = {
+    'meta': {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'commit': get_git_commit(),
+        'sizes': args.sizes,
+        'repeats': args.repeats,
+        'batchSize': args.batch_size
+    },
+    'results': results
+}
+
+if args.output is not None:
+    with open(args.output, 'w') as outputFile:
+        json.dump(output, outputFile, indent=2)
+if args.json:
+    json.dump(output, sys.stdout, indent=2)
+    print()
@@ -0,0 +1,64 @@
+import itertools
+import json
+import random
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Generator, List
+
+from scripts.types import BotConfig, ServerConfig
+
+BOTS_PER_SERVER = 32
+
+
+def generate_configs(bots: int, seed: int = 0) -> List[ServerConfig]:
+    # Fill servers with 32 bots (16 slots) each, the last one getting whatever is left
+    rng = random.Random(seed)
+    configs = []
+    for (i, start) in enumerate(range(0, bots, BOTS_PER_SERVER)):
+        count = min(BOTS_PER_SERVER, bots - start)
+        configs.append(ServerConfig(
+            name=f'server-{i}',
+            address=f'10.{i // 256 % 256}.{i % 256}.1',
+            port=16567,
+            query_port=29900,
+            mod='mods/bf2',
+            slots=max(count // 2 - count // 2 % 2, 2),
+            reserved_slots=2,
+            bots=[
+                BotConfig(basename=f'Bot{start + j:07d}', password=f'{rng.getrandbits(40):010x}')
+                for j in range(count)
+            ]
+        ))
+    return configs
+
+
+class GlitchStandInHandler(BaseHTTPRequestHandler):
+    # Keep connections alive like the real API, sending responses right away instead of waiting for delayed ACKs
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    counter = itertools.count()
+
+    def do_GET(self) -> None:
+        # Mimic the gamertag generator API's response format, handing out unique names
+        body = json.dumps({'data': [{'name': f'Tag{next(self.counter):08d}'} for _ in range(6)]}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+@contextmanager
+def glitch_stand_in() -> Generator[str, None, None]:
+    server = ThreadingHTTPServer(('127.0.0.1', 0), GlitchStandInHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_address[1]}/generators/gamertag-generator'
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,588 @@
+import csv
+import itertools
+import os
+import sqlite3
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Dict, Generator, Iterable, List, Optional, Set, TextIO, Tuple, Type
+
+import mysql.connector
+
+from scripts.journal import ProvisioningJournal
+from scripts.stats import Stats
+from scripts.types import ServerConfig
+from scripts.validation import MAX_BASENAME_LENGTH
+
+
+PID_SEQUENCE_TABLE = 'bot_manager_pid_sequence'
+# Accounts added by provisioning runs, which are the only ones we may ever delete again
+OWNED_ACCOUNTS_TABLE = 'bot_manager_accounts'
+FIRST_PID = 50000001
+# Number of times to reserve new pids for accounts whose pid was taken by someone else while we were inserting
+PID_RETRIES = 3
+# Bot names rotate through suffixes ^0 to ^f unless configured otherwise
+NAME_SUFFIXES = 16
+# Number of names/ids to look up per statement when checking rows written in a single transaction
+LOOKUP_CHUNK_SIZE = 1000
+ACCOUNT_COLUMNS = ['id', 'name', 'password', 'email', 'country']
+
+
+class DatabaseBackend(str, Enum):
+    MySQL = 'mysql'
+    SQLite = 'sqlite'
+
+
+class ExportFormat(str, Enum):
+    CSV = 'csv'
+    SQL = 'sql'
+
+
+@dataclass
+class DatabaseTarget:
+    backend: DatabaseBackend
+    database: str
+    host: Optional[str] = None
+    port: int = 3306
+    user: Optional[str] = None
+    password: Optional[str] = None
+
+    @staticmethod
+    def load(data: dict) -> 'DatabaseTarget':
+        return DatabaseTarget(
+            backend=DatabaseBackend(data.get('backend', str())),
+            database=data.get('database', str()),
+            host=data.get('host'),
+            port=data.get('port', 3306),
+            user=data.get('user'),
+            password=data.get('password')
+        )
+
+    def __str__(self) -> str:
+        if self.backend is DatabaseBackend.MySQL:
+            return f'{self.backend.value}://{self.user}@{self.host}:{self.port}/{self.database}'
+        return f'{self.backend.value}://{self.database}'
+
+
+@dataclass
+class ProvisioningResult:
+    inserted: int = 0
+    skipped: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    error: Optional[str] = None
+    stats: Optional[Stats] = None
+
+
+def chunked(items: Iterable, size: int) -> Generator[list, None, None]:
+    iterator = iter(items)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def get_account_names(basename: str, suffixes: Optional[int] = NAME_SUFFIXES) -> List[str]:
+    # Bots which don't rotate their names log in using the bare basename
+    if suffixes is None:
+        return [basename]
+    return [f'{basename}^{i:x}' for i in range(0, suffixes)]
+
+
+def get_name_suffixes(config: ServerConfig) -> Optional[int]:
+    if config.rotate_bot_names is False:
+        return None
+    return config.bot_name_suffixes if config.bot_name_suffixes is not None else NAME_SUFFIXES
+
+
+def iter_accounts(configs: Iterable[ServerConfig]) -> Generator[Tuple[str, str], None, None]:
+    # Bots may be configured on multiple servers, which only need the accounts any of those servers uses
+    seen = set()
+    for config in configs:
+        suffixes = get_name_suffixes(config)
+        for bot in config.bots:
+            # Name must be leave space for 2 character name suffix ("^{number}")
+            if len(bot.basename) > MAX_BASENAME_LENGTH:
+                print(f'Name "{bot.basename}" is too long ({MAX_BASENAME_LENGTH} characters max.), skipping name')
+                continue
+
+            for name in get_account_names(bot.basename, suffixes):
+                if name not in seen:
+                    seen.add(name)
+                    yield name, bot.password
+
+
+def build_accounts(configs: Iterable[ServerConfig]) -> List[Tuple[str, str]]:
+    return list(iter_accounts(configs))
+
+
+def strip_name_suffix(name: str) -> str:
+    return name[:-2] if name[-2:-1] == '^' else name
+
+
+def make_account_row(pid: int, name: str, password: str) -> dict:
+    return {
+        'id': pid,
+        'name': name,
+        'password': password,
+        'email': 'bla@bla.com',
+        'country': 'DE'
+    }
+
+
+def iter_account_rows(accounts: Iterable[Tuple[str, str]], first_pid: int) -> Generator[dict, None, None]:
+    for i, (name, password) in enumerate(accounts):
+        yield make_account_row(first_pid + i, name, password)
+
+
+def write_csv(rows: Iterable[dict], file: TextIO) -> int:
+    writer = csv.DictWriter(file, ACCOUNT_COLUMNS, lineterminator='\n')
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+
+    return count
+
+
+def quote_sql_value(value: Any) -> str:
+    if isinstance(value, int):
+        return str(value)
+    # MySQL treats backslashes in strings as escape characters (unless NO_BACKSLASH_ESCAPES is set)
+    return "'" + str(value).replace('\\', '\\\\').replace("'", "''") + "'"
+
+
+def write_sql(rows: Iterable[dict], file: TextIO, batch_size: int) -> int:
+    count = 0
+    for batch in chunked(rows, batch_size):
+        values = ',\n'.join(f'({", ".join(quote_sql_value(row[c]) for c in ACCOUNT_COLUMNS)})' for row in batch)
+        file.write(f'INSERT INTO accounts ({", ".join(ACCOUNT_COLUMNS)}) VALUES\n{values};\n')
+        count += len(batch)
+
+    return count
+
+
+def export_rows(rows: Iterable[dict], file: TextIO, fmt: ExportFormat, batch_size: int) -> int:
+    if fmt is ExportFormat.CSV:
+        return write_csv(rows, file)
+    return write_sql(rows, file, batch_size)
+
+
+def prepare_statement(table: str, columns: List[str], backend: DatabaseBackend) -> str:
+    if backend is DatabaseBackend.MySQL:
+        placeholders = [f'%({c})s' for c in columns]
+    else:
+        placeholders = [f':{c}' for c in columns]
+
+    return f'INSERT INTO {table} ({", ".join(columns)}) VALUES ({", ".join(placeholders)})'
+
+
+class AccountStore(ABC):
+    backend: DatabaseBackend
+    errors: Tuple[Type[Exception], ...]
+    stats: Stats
+
+    def __init__(self, connection, cursor):
+        self.connection = connection
+        self.cursor = cursor
+        self.stats = Stats()
+
+    @staticmethod
+    @abstractmethod
+    def connect(target: DatabaseTarget, bulk_load: bool = False) -> 'AccountStore':
+        pass
+
+    @property
+    @abstractmethod
+    def placeholder(self) -> str:
+        pass
+
+    @abstractmethod
+    def prepare_upsert_statement(self, table: str, columns: List[str], key: str = 'name') -> str:
+        pass
+
+    @abstractmethod
+    def lock_pid_sequence(self) -> int:
+        pass
+
+    @abstractmethod
+    def is_id_conflict(self, error: Exception) -> bool:
+        pass
+
+    @abstractmethod
+    def bulk_load(self, rows: List[dict], result: ProvisioningResult,
+                  on_commit: Optional[Callable[[List[dict]], None]] = None) -> List[dict]:
+        pass
+
+    def close(self) -> None:
+        self.cursor.close()
+        self.connection.close()
+
+    def commit(self) -> None:
+        with self.stats.timed('commit'):
+            self.connection.commit()
+        self.stats.count('commits')
+
+    def rollback(self) -> None:
+        with self.stats.timed('rollback'):
+            self.connection.rollback()
+        self.stats.count('rollbacks')
+
+    def prepare_in_clause(self, count: int) -> str:
+        return f'IN ({", ".join([self.placeholder] * count)})'
+
+    def fetch_existing_names(self, names: List[str], chunk_size: int) -> Set[str]:
+        existing = set()
+        for chunk in chunked(names, chunk_size):
+            with self.stats.timed('select'):
+                self.cursor.execute(f'SELECT name FROM accounts WHERE name {self.prepare_in_clause(len(chunk))}',
+                                    chunk)
+            existing.update(row['name'] for row in self.cursor.fetchall())
+
+        return existing
+
+    def record_written(self, rows: List[dict], written: int, result: ProvisioningResult,
+                       on_commit: Optional[Callable[[List[dict]], None]] = None) -> List[dict]:
+        added = rows
+        conflicts = list()
+        if written < len(rows):
+            # Rows may not only have been ignored for an existing name, but also for an id handed out to someone else
+            # (e.g. a player signing up), in which case the account was not added at all
+            existing = self.fetch_existing_names([row['name'] for row in rows], LOOKUP_CHUNK_SIZE)
+            added = [row for row in rows if row['name'] in existing]
+            conflicts = [row for row in rows if row['name'] not in existing]
+            self.stats.count('rows.id_conflict', len(conflicts))
+
+        # Rows ignored by the database were added by someone else since we looked (e.g. by a parallel run)
+        result.inserted += written
+        result.skipped += len(added) - written
+        if on_commit is not None:
+            on_commit(added)
+
+        return conflicts
+
+    def reserve_pids(self, count: int) -> int:
+        self.cursor.execute(
+            f'CREATE TABLE IF NOT EXISTS {PID_SEQUENCE_TABLE} (name VARCHAR(32) PRIMARY KEY, next_id BIGINT NOT NULL)'
+        )
+        self.cursor.execute(self.prepare_upsert_statement(PID_SEQUENCE_TABLE, ['name', 'next_id']),
+                            {'name': 'accounts', 'next_id': 0})
+        self.commit()
+
+        try:
+            next_id = self.lock_pid_sequence()
+            # Accounts may also be added by other means (e.g. players signing up), so never hand out ids below those
+            self.cursor.execute('SELECT MAX(id) AS id FROM accounts')
+            last_id = self.cursor.fetchall().pop()['id']
+            first_pid = max(next_id, last_id + 1 if last_id is not None else FIRST_PID)
+
+            self.cursor.execute(
+                f"UPDATE {PID_SEQUENCE_TABLE} SET next_id = {first_pid + count} WHERE name = 'accounts'"
+            )
+            self.commit()
+        except self.errors:
+            self.rollback()
+            raise
+
+        return first_pid
+
+    def create_owned_table(self) -> None:
+        # Create the table up front, since MySQL would implicitly commit any insert transaction creating it
+        self.cursor.execute(
+            f'CREATE TABLE IF NOT EXISTS {OWNED_ACCOUNTS_TABLE} (id BIGINT PRIMARY KEY, name VARCHAR(64) NOT NULL)'
+        )
+        self.commit()
+
+    def record_owned(self, rows: List[dict]) -> None:
+        # Must run in the transaction adding the rows, so an account is never added without being recorded as ours.
+        # Only rows actually holding our id and name were added by us, any others were ignored by the database.
+        owned = list()
+        for chunk in chunked(rows, LOOKUP_CHUNK_SIZE):
+            with self.stats.timed('select'):
+                self.cursor.execute(f'SELECT id, name FROM accounts WHERE id {self.prepare_in_clause(len(chunk))}',
+                                    [row['id'] for row in chunk])
+            found = {(row['id'], row['name']) for row in self.cursor.fetchall()}
+            owned.extend({'id': row['id'], 'name': row['name']} for row in chunk if (row['id'], row['name']) in found)
+
+        if len(owned) > 0:
+            with self.stats.timed('insert'):
+                self.cursor.executemany(self.prepare_upsert_statement(OWNED_ACCOUNTS_TABLE, ['id', 'name'], 'id'),
+                                        owned)
+
+    def upsert(self, rows: Iterable[dict], batch_size: int, result: ProvisioningResult,
+               on_commit: Optional[Callable[[List[dict]], None]] = None) -> List[dict]:
+        # Rows which could not be added because their id was taken are returned, so they can get new ids
+        sql = self.prepare_upsert_statement('accounts', ACCOUNT_COLUMNS)
+        conflicts = list()
+        for batch in chunked(rows, batch_size):
+            # Write each batch in a single transaction, mysql-connector will even turn it into a multi-row INSERT
+            try:
+                with self.stats.timed('insert'):
+                    self.cursor.executemany(sql, batch)
+                written = self.cursor.rowcount
+                self.record_owned(batch)
+                self.commit()
+            except self.errors as e:
+                self.rollback()
+                if self.is_id_conflict(e):
+                    # Taken id failed the whole batch, all of its rows need new ids
+                    self.stats.count('rows.id_conflict', len(batch))
+                    conflicts.extend(batch)
+                    continue
+                print(e)
+                self.stats.count(f'errors.{type(e).__name__}')
+                result.failed += len(batch)
+                continue
+
+            conflicts.extend(self.record_written(batch, written, result, on_commit))
+
+        return conflicts
+
+    def update_passwords(self, passwords: Dict[str, str]) -> int:
+        # Accounts share their basename's password, so all of them can be updated with a single statement.
+        # Changes are not committed here, since they should only be committed along with the config.
+        updated = 0
+        for basename, password in passwords.items():
+            # Update accounts of any layout, the bots' servers may have changed their name rotation settings
+            names = [basename, *get_account_names(basename)]
+            self.cursor.execute(
+                f'UPDATE accounts SET password = {self.placeholder} WHERE name {self.prepare_in_clause(len(names))}',
+                [password, *names]
+            )
+            updated += self.cursor.rowcount
+
+        return updated
+
+    def iter_names(self, chunk_size: int) -> Generator[str, None, None]:
+        self.cursor.execute('SELECT name FROM accounts')
+        while rows := self.cursor.fetchmany(chunk_size):
+            for row in rows:
+                yield row['name']
+
+    def fetch_owned_accounts(self, chunk_size: int) -> Optional[List[Tuple[int, str]]]:
+        # Accounts recorded as ours still need to match by name, their id may have been handed out again since
+        try:
+            self.cursor.execute(f'SELECT o.id, o.name FROM {OWNED_ACCOUNTS_TABLE} o '
+                                f'JOIN accounts a ON a.id = o.id AND a.name = o.name')
+        except self.errors:
+            # Table does not exist until accounts are first added by a provisioning run
+            self.rollback()
+            return None
+
+        owned = list()
+        while rows := self.cursor.fetchmany(chunk_size):
+            owned.extend((row['id'], row['name']) for row in rows)
+
+        return owned
+
+    def delete_ids(self, ids: List[int], chunk_size: int,
+                   on_commit: Optional[Callable[[int, int], None]] = None) -> int:
+        # Delete by primary key in one transaction per chunk, so locks are held only briefly and progress is kept
+        deleted = 0
+        for chunk in chunked(ids, chunk_size):
+            with self.stats.timed('delete'):
+                self.cursor.execute(f'DELETE FROM accounts WHERE id {self.prepare_in_clause(len(chunk))}', chunk)
+            chunk_deleted = self.cursor.rowcount
+            self.cursor.execute(f'DELETE FROM {OWNED_ACCOUNTS_TABLE} WHERE id {self.prepare_in_clause(len(chunk))}',
+                                chunk)
+            self.commit()
+            deleted += chunk_deleted
+            if on_commit is not None:
+                on_commit(len(chunk), chunk_deleted)
+
+        return deleted
+
+
+class MySQLAccountStore(AccountStore):
+    backend = DatabaseBackend.MySQL
+    errors = (mysql.connector.errors.Error,)
+
+    @staticmethod
+    def connect(target: DatabaseTarget, bulk_load: bool = False) -> 'MySQLAccountStore':
+        connection = mysql.connector.connect(
+            host=target.host,
+            port=target.port,
+            user=target.user,
+            passwd=target.password,
+            database=target.database,
+            allow_local_infile=bulk_load
+        )
+        return MySQLAccountStore(connection, connection.cursor(dictionary=True))
+
+    @property
+    def placeholder(self) -> str:
+        return '%s'
+
+    def prepare_upsert_statement(self, table: str, columns: List[str], key: str = 'name') -> str:
+        # Updating the key to itself is a no-op, which (unlike INSERT IGNORE) does not also swallow other errors
+        return f'{prepare_statement(table, columns, self.backend)} ON DUPLICATE KEY UPDATE {columns[0]} = {columns[0]}'
+
+    def lock_pid_sequence(self) -> int:
+        self.connection.start_transaction()
+        self.cursor.execute(f"SELECT next_id FROM {PID_SEQUENCE_TABLE} WHERE name = 'accounts' FOR UPDATE")
+        return self.cursor.fetchall().pop()['next_id']
+
+    def is_id_conflict(self, error: Exception) -> bool:
+        # Upserts silently ignore duplicate ids on MySQL, this only applies to statements that raise for them
+        return (isinstance(error, mysql.connector.errors.IntegrityError) and error.errno == 1062
+                and 'PRIMARY' in str(error))
+
+    def bulk_load(self, rows: List[dict], result: ProvisioningResult,
+                  on_commit: Optional[Callable[[List[dict]], None]] = None) -> List[dict]:
+        # Stream rows to a temporary file and let the server load them, which is by far the fastest way to add rows
+        with self.stats.span('write_csv'), tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as file:
+            write_csv(rows, file)
+        try:
+            with self.stats.timed('insert'):
+                self.cursor.execute(
+                    "LOAD DATA LOCAL INFILE %s IGNORE INTO TABLE accounts "
+                    "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' LINES TERMINATED BY '\\n' "
+                    f"({', '.join(ACCOUNT_COLUMNS)})",
+                    (file.name,)
+                )
+            written = self.cursor.rowcount
+            self.record_owned(rows)
+            self.commit()
+        except self.errors:
+            self.rollback()
+            raise
+        finally:
+            os.remove(file.name)
+
+        return self.record_written(rows, written, result, on_commit)
+
+
+class SQLiteAccountStore(AccountStore):
+    backend = DatabaseBackend.SQLite
+    errors = (sqlite3.Error,)
+
+    @staticmethod
+    def connect(target: DatabaseTarget, bulk_load: bool = False) -> 'SQLiteAccountStore':
+        connection = sqlite3.connect(target.database)
+        connection.row_factory = sqlite3.Row
+        cursor = connection.cursor()
+
+        # Trade some durability for speed while bulk-writing. Unlike the journal mode, this only affects our own
+        # connection, so the login emulator keeps using the database as it is configured.
+        if bulk_load:
+            cursor.execute('PRAGMA synchronous = NORMAL')
+
+        return SQLiteAccountStore(connection, cursor)
+
+    @property
+    def placeholder(self) -> str:
+        return '?'
+
+    def prepare_upsert_statement(self, table: str, columns: List[str], key: str = 'name') -> str:
+        # Only ignore rows conflicting on the key, any other conflict (such as a taken id) must fail the insert
+        return f'{prepare_statement(table, columns, self.backend)} ON CONFLICT({key}) DO NOTHING'
+
+    def lock_pid_sequence(self) -> int:
+        self.cursor.execute('BEGIN IMMEDIATE')
+        self.cursor.execute(f"SELECT next_id FROM {PID_SEQUENCE_TABLE} WHERE name = 'accounts'")
+        return self.cursor.fetchall().pop()['next_id']
+
+    def is_id_conflict(self, error: Exception) -> bool:
+        return isinstance(error, sqlite3.IntegrityError) and 'accounts.id' in str(error)
+
+    def bulk_load(self, rows: List[dict], result: ProvisioningResult,
+                  on_commit: Optional[Callable[[List[dict]], None]] = None) -> List[dict]:
+        # SQLite has no bulk loader, but a single executemany transaction comes close
+        self.cursor.execute('BEGIN')
+        try:
+            with self.stats.timed('insert'):
+                self.cursor.executemany(self.prepare_upsert_statement('accounts', ACCOUNT_COLUMNS), rows)
+            written = self.cursor.rowcount
+            self.record_owned(rows)
+            self.commit()
+        except self.errors as e:
+            self.rollback()
+            if self.is_id_conflict(e):
+                self.stats.count('rows.id_conflict', len(rows))
+                return rows
+            raise
+
+        return self.record_written(rows, written, result, on_commit)
+
+
+ACCOUNT_STORES: Dict[DatabaseBackend, Type[AccountStore]] = {
+    DatabaseBackend.MySQL: MySQLAccountStore,
+    DatabaseBackend.SQLite: SQLiteAccountStore
+}
+
+
+def connect(target: DatabaseTarget, bulk_load: bool = False) -> AccountStore:
+    return ACCOUNT_STORES[target.backend].connect(target, bulk_load)
+
+
+def provision(store: AccountStore, accounts: List[Tuple[str, str]], batch_size: int,
+              bulk_load: bool = False, journal: Optional[ProvisioningJournal] = None) -> ProvisioningResult:
+    stats = store.stats
+    result = ProvisioningResult(stats=stats)
+    start = time.perf_counter()
+
+    digest = ProvisioningJournal.get_digest(name for name, _ in accounts) if journal is not None else None
+    if journal is not None and journal.exists():
+        if journal.digest != digest:
+            raise Exception(f'Accounts in config changed since the interrupted run, cannot resume ({journal.path})')
+
+        # Rows recorded as completed were committed, so there is no need to even look them up again
+        passwords = dict(accounts)
+        rows = [make_account_row(pid, name, passwords[name]) for pid, name in journal.pending()]
+        existing = len(accounts) - len(rows)
+        stats.count('rows.resumed', len(rows))
+    else:
+        with stats.span('lookup'):
+            found = store.fetch_existing_names([name for name, _ in accounts], batch_size)
+            missing = [(name, password) for name, password in accounts if name not in found]
+        existing = len(found)
+
+        rows = list()
+        if len(missing) > 0:
+            # Reserve pids for all accounts up front, so we don't collide with any provisioning runs in parallel
+            with stats.span('reserve_pids'):
+                first_pid = store.reserve_pids(len(missing))
+            if journal is not None:
+                journal.start(digest, first_pid, [name for name, _ in missing])
+            rows = list(iter_account_rows(missing, first_pid))
+    result.skipped += existing
+
+    def on_commit(batch: List[dict]) -> None:
+        if journal is not None:
+            journal.complete([row['name'] for row in batch])
+
+    def write(batch: List[dict]) -> List[dict]:
+        with stats.span('insert'):
+            if bulk_load:
+                return store.bulk_load(batch, result, on_commit)
+            return store.upsert(batch, batch_size, result, on_commit)
+
+    conflicts = list()
+    if len(rows) > 0:
+        store.create_owned_table()
+        conflicts = write(rows)
+    for _ in range(PID_RETRIES):
+        if len(conflicts) == 0:
+            break
+
+        # Someone else (e.g. a player signing up) took some of our pids, so reserve new ones for the affected accounts.
+        # The journal has to know about them before inserting, else resuming would retry the taken pids again.
+        with stats.span('reserve_pids'):
+            first_pid = store.reserve_pids(len(conflicts))
+        if journal is not None:
+            journal.reassign(first_pid, [row['name'] for row in conflicts])
+        conflicts = write([{**row, 'id': first_pid + i} for i, row in enumerate(conflicts)])
+    result.failed += len(conflicts)
+
+    # Nothing is left to resume once every account made it into the database
+    if journal is not None and result.failed == 0:
+        journal.remove()
+
+    result.elapsed = time.perf_counter() - start
+    # Rows skipped beyond the ones we found up front were added by someone else while we were inserting
+    stats.count('rows.attempted', len(accounts))
+    stats.count('rows.existing', existing)
+    stats.count('rows.inserted', result.inserted)
+    stats.count('rows.duplicate', result.skipped - existing)
+    stats.count('rows.failed', result.failed)
+    return result
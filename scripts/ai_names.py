@@ -1,514 +1,550 @@
-AI_NAMES = {
-    'C.Sandstrom',
-    'O.Johansson',
-    'K.Bergqvist',
-    'L.Westerlund',
+import bisect
+import functools
+import math
+import random
+from typing import Generator, Set, Tuple
+
+# Sorted by length first, so all names up to a given length form a prefix of the tuple
+AI_NAMES = (
+    'M.Le',
+    'D.Mod',
+    'D.Yee',
+    'K.Lee',
+    'K.Yip',
+    'A.Falk',
+    'A.Holm',
+    'C.Lind',
+    'D.Kerr',
+    'D.King',
+    'E.Horn',
+    'F.Berg',
+    'H.Berg',
+    'H.Falk',
+    'H.Fors',
+    'J.Berg',
     'J.Biro',
-    'C.Bjorkman',
-    'N.Bergquist',
-    'S.Decker',
-    'J.Berglund',
+    'J.Dohl',
+    'J.Falk',
+    'J.Holm',
+    'J.Horn',
+    'J.Lord',
+    'J.Nord',
+    'J.Ross',
+    'J.Salt',
+    'M.Choy',
+    'M.Hall',
+    'O.Berg',
+    'O.Holm',
+    'R.Love',
+    'R.Pace',
+    'S.Borg',
+    'S.Falk',
+    'S.Horn',
+    'T.Dahl',
+    'T.Fors',
+    'T.Sten',
+    'U.Rask',
+    'V.Lind',
+    'B.Smith',
+    'C.Grass',
+    'C.Strom',
+    'D.Skarp',
+    'E.Smith',
+    'G.Ekman',
+    'H.Bjorn',
+    'J.Aberg',
+    'J.Ceron',
+    'J.Evans',
+    'J.Price',
+    'J.Skarp',
+    'J.Stahl',
+    'K.Ekman',
+    'K.Hoang',
+    'L.Brown',
+    'M.Bagge',
+    'M.Doran',
+    'N.Goksu',
+    'N.White',
+    'R.Linde',
+    'S.Abdey',
+    'S.Bjork',
+    'S.Flyte',
+    'T.Bjork',
+    'T.Strom',
+    'W.Young',
+    'A.Marini',
+    'A.Nilson',
+    'A.Nyberg',
+    'A.Ohlson',
     'A.Olsson',
-    'R.Sjoberg',
-    'P.Lindahl',
-    'P.Nystrom',
-    'K.Olsson',
-    'R.Forsgren',
-    'T.Lindqvist',
-    'M.Belanger',
     'A.Wallin',
-    'K.Andersson',
-    'C.Wahlberg',
-    'S.Wikman',
-    'V.Ekstrom',
-    'P.Bergman',
-    'R.Linde',
-    'L.Ekberg',
-    'L.Eriksson',
+    'C.Cyreus',
+    'C.Nilson',
+    'D.Aberin',
+    'E.Nilson',
+    'E.Olsson',
+    'F.Nilson',
     'F.Olsson',
-    'H.Fredrikson',
+    'F.Sjodin',
+    'G.Nygren',
+    'G.Ohlson',
+    'G.Olsson',
+    'G.Pigula',
+    'H.Ekberg',
+    'H.Nilson',
+    'H.Nygren',
+    'H.Olsson',
+    'H.Wallin',
+    'J.Newton',
+    'J.Nilson',
     'J.Ohlson',
-    'J.Ceron',
-    'C.Johansson',
-    'E.Westerlund',
+    'J.Olsson',
+    'J.Ostman',
+    'J.Sanick',
+    'J.Vifian',
+    'K.Nyholm',
+    'K.Olsson',
+    'L.Ekberg',
+    'L.Fujita',
+    'L.Nilson',
+    'L.Nyberg',
+    'L.Nygren',
+    'L.Wallin',
+    'M.Eklund',
+    'M.Fritze',
+    'M.Nilson',
+    'M.Nyholm',
+    'M.Ohlson',
+    'O.Carlen',
+    'O.Nilson',
+    'P.Ekberg',
+    'P.Hoyles',
+    'P.Nilson',
+    'P.Olsson',
+    'R.Edgren',
+    'R.Ekberg',
+    'R.Gimbel',
+    'R.Nilson',
+    'R.Nyholm',
+    'R.Sjodin',
+    'R.Walton',
+    'R.Wikman',
+    'S.Decker',
+    'S.Nilson',
+    'S.Olsson',
+    'S.Wikman',
+    'T.Berger',
+    'T.Laedre',
+    'T.Nilson',
+    'T.Nygren',
+    'T.Olsson',
+    'T.Wallin',
+    'V.Nilson',
+    'A.Ekstrom',
+    'A.Hedlund',
+    'A.Jansson',
+    'A.Nilsson',
     'A.Nystrom',
-    'L.Hedlund',
-    'M.Hedlund',
-    'M.Wallberg',
-    'E.Smith',
-    'T.Axelsson',
-    'J.Dohl',
-    'D.Yee',
-    'T.Westerlund',
+    'A.Salberg',
+    'B.Hedberg',
+    'B.Larsson',
+    'C.Barnett',
+    'C.Bergman',
+    'C.Elliott',
+    'C.Larsson',
+    'C.Nilsson',
+    'D.Rickard',
     'D.Sirland',
-    'M.Rudberg',
-    'L.Jonsson',
-    'A.Sandberg',
-    'R.Walton',
-    'J.Newton',
-    'F.Nilson',
+    'D.Wiksten',
+    'E.Hansson',
+    'E.Larsson',
+    'E.Sjovold',
+    'F.Larsson',
+    'F.Morales',
+    'F.Nilsson',
+    'G.Forsman',
+    'G.Larsson',
+    'G.Nystrom',
+    'H.Forsman',
+    'H.Jansson',
+    'H.Jonsson',
+    'H.Nilsson',
+    'H.Persson',
+    'H.Sjoberg',
+    'J.Dawsari',
+    'J.Hallman',
     'J.Hedberg',
-    'S.Pettersson',
-    'J.Vifian',
-    'P.Anderson',
-    'D.King',
     'J.Hedlund',
-    'R.Lindholm',
-    'G.Sandberg',
-    'P.Berglund',
-    'R.Bjorklund',
-    'C.Elliott',
-    'T.Wikstrom',
-    'S.Rydberg',
+    'J.Jonsson',
+    'J.Nilsson',
     'J.Norberg',
-    'O.Carlen',
+    'J.Persson',
+    'K.Hedberg',
+    'K.Hellman',
+    'K.Nilsson',
+    'K.Norrman',
+    'K.Sjoberg',
+    'L.Erikson',
+    'L.Forsman',
+    'L.Hansson',
+    'L.Hedlund',
+    'L.Jonsson',
+    'L.Larsson',
+    'L.Nilsson',
+    'L.Persson',
+    'M.Cassidy',
+    'M.Ekstrom',
+    'M.Forsman',
+    'M.Hedberg',
+    'M.Hedlund',
+    'M.Jonsson',
+    'M.Larsson',
     'M.Livesey',
-    'F.Lindblad',
-    'J.Karlberg',
-    'K.Hegethorn',
-    'V.Erikson',
-    'J.Holm',
-    'C.Sahlberg',
-    'J.Kjellstrom',
-    'N.Stromquist',
-    'O.Eriksson',
-    'S.Johansson',
-    'S.Bjork',
-    'H.Sandstrom',
-    'A.Ekstrom',
-    'R.Smedberg',
-    'M.Lindgren',
+    'M.Nilsson',
     'M.Nystrom',
-    'N.White',
-    'G.Nystrom',
-    'N.Nyquist',
-    'F.Liliegren',
-    'M.Bergkvist',
-    'T.Forsberg',
-    'M.Stenlund',
-    'S.Hedlund',
-    'H.Nygren',
-    'G.Nygren',
-    'N.Hornberg',
-    'D.Mod',
-    'C.Cyreus',
-    'U.Rask',
-    'J.Svensson',
-    'L.Fujita',
-    'L.Nyberg',
-    'S.Bergman',
-    'B.Larsson',
-    'A.Gustafsson',
-    'T.Bergman',
-    'M.Eklund',
-    'G.Stromberg',
-    'R.Nyholm',
-    'M.Kopparhed',
+    'M.Rudberg',
+    'M.Sjoberg',
+    'M.Wiklund',
+    'N.Karlsen',
+    'N.Nyquist',
+    'O.Bergman',
+    'O.Hallman',
+    'O.Larsson',
+    'O.Nilsson',
+    'P.Bergman',
+    'P.Hedlund',
+    'P.Lindahl',
+    'P.Nystrom',
+    'P.Westman',
     'R.Forsman',
-    'M.Nilsson',
     'R.Larsson',
-    'L.Hansson',
-    'J.Sanick',
-    'J.Holmberg',
-    'A.Eriksson',
-    'K.Nyholm',
-    'H.Persson',
-    'M.Wiklund',
-    'J.Falk',
-    'K.Lundberg',
-    'T.Karlsson',
-    'E.Douridas',
-    'J.Ross',
-    'H.Olsson',
-    'S.Pinkerton',
-    'H.Sjoberg',
-    'R.Edgren',
-    'J.Aberg',
+    'R.Nilsson',
+    'R.Sjoberg',
+    'S.Bergman',
     'S.Forsman',
-    'A.Hedlund',
-    'B.Kristiansson',
-    'K.Stromberg',
-    'S.Parkinson',
-    'C.Berglund',
-    'O.Bergman',
-    'T.Berglund',
-    'M.Svensson',
-    'T.Lindgren',
-    'H.Berg',
-    'M.Sandstrom',
-    'J.Andersson',
-    'K.Stefansson',
-    'V.Soderlund',
-    'H.Fors',
-    'F.Nilsson',
-    'M.Kylmamaa',
-    'G.Eriksson',
-    'T.Nygren',
-    'T.Andersson',
-    'C.Nilsson',
-    'E.Olsson',
-    'A.Fredriksson',
-    'E.Horn',
-    'V.Nordstrom',
-    'O.Hedstrom',
-    'R.Stenlund',
-    'R.Sahlberg',
-    'L.Forsberg',
-    'R.Hellberg',
-    'H.Falk',
-    'P.Stenberg',
-    'M.Anderson',
-    'M.Johansson',
-    'O.Stromberg',
-    'K.Stenlund',
-    'S.Lindholm',
-    'L.Hellstrom',
-    'C.Lind',
-    'P.Svensson',
-    'F.Stenberg',
-    'O.Lindstrom',
-    'T.Fors',
-    'H.Forsgren',
-    'P.Soderstrom',
-    'A.Sahlberg',
-    'T.Olsson',
-    'M.Larsson',
-    'F.Lindblom',
-    'T.Jakobsson',
-    'E.Nilson',
-    'V.Stenlund',
-    'L.Persson',
-    'R.Gustafsson',
-    'G.Andersson',
-    'O.Holm',
-    'P.Wikander',
-    'M.Soderberg',
-    'L.Brown',
-    'P.Soderlund',
-    'D.Skarp',
-    'C.Nilson',
-    'M.Forslund',
-    'M.Sjoberg',
-    'L.Erikson',
-    'G.Anderson',
-    'J.Dawsari',
-    'D.Aberin',
-    'R.Nilson',
-    'J.Wikstrom',
-    'M.Ekstrom',
-    'J.Berg',
-    'J.Soderberg',
-    'M.Nordberg',
-    'N.Wallstrom',
-    'T.Fredriksson',
-    'P.Bjorklund',
-    'J.Lord',
-    'M.Hedstrom',
-    'E.Axelsson',
-    'F.Martensson',
-    'L.Nilson',
-    'P.Jakobsson',
+    'S.Hedlund',
+    'S.Nilsson',
+    'S.Ohlsson',
+    'S.Rydberg',
+    'T.Bergman',
+    'T.Jonsson',
+    'T.Larsson',
     'T.Nystrom',
-    'R.Nilsson',
-    'M.Henriksson',
-    'P.Hedlund',
-    'N.Olofsson',
-    'T.Strom',
-    'K.Lindqvist',
-    'T.Holmsten',
-    'J.Salt',
-    'O.Nilsson',
-    'L.Gustavsson',
-    'L.Vikstrom',
-    'A.Salberg',
-    'M.Gustafson',
-    'V.Berggren',
-    'M.Lindholm',
-    'R.Pace',
-    'O.Larsson',
-    'R.Olofsson',
-    'A.Wikstrom',
-    'T.Berger',
-    'G.Nordstrom',
-    'B.Smith',
-    'K.Hoang',
-    'N.Bergstrom',
-    'M.Lindqvist',
-    'F.Sjodin',
-    'L.Nilsson',
+    'V.Ekstrom',
+    'V.Erikson',
+    'V.Forsman',
     'V.Hellman',
-    'P.Olsson',
-    'J.Ostman',
-    'O.Lindberg',
-    'O.Lindmark',
-    'T.Nilson',
-    'L.Johansson',
-    'K.Yip',
-    'G.Wikstrom',
-    'L.Sandstrom',
-    'C.Larsson',
+    'V.Nilsson',
     'V.Nystrom',
-    'R.Holmberg',
-    'L.Nygren',
-    'J.Karlsson',
-    'A.Gottfridsson',
-    'L.Kjellberg',
-    'A.Nordstrom',
-    'G.Larsson',
-    'V.Andersson',
-    'G.Forsman',
-    'S.Bergstrom',
-    'S.Sandberg',
-    'V.Lind',
-    'H.Sandberg',
-    'C.Forslund',
-    'J.Gonzales',
-    'F.Berglund',
-    'R.Forsberg',
-    'M.Karlberg',
-    'M.Hornlund',
-    'A.Falk',
-    'C.Bergqvist',
-    'H.Gustafsson',
-    'S.Lindstrom',
-    'R.Wikstrom',
-    'K.Lee',
-    'J.Gustavsson',
-    'C.Svanberg',
-    'D.Wiksten',
-    'N.Soderberg',
-    'S.Borg',
-    'T.Bjornlund',
-    'A.Marini',
-    'L.Ekstrand',
-    'A.Ohlson',
-    'E.Larsson',
-    'M.Hallberg',
-    'S.Wahlberg',
-    'J.Olsson',
-    'A.Westerberg',
-    'R.Love',
-    'M.Westerberg',
-    'H.Johansson',
-    'E.Lindstrom',
-    'J.Horn',
-    'N.Hellstrom',
-    'S.Sjostrom',
-    'M.Olofsson',
-    'O.Westerlund',
-    'S.Lindqvist',
-    'H.Karlsson',
-    'G.Pigula',
-    'P.K.Johansson',
-    'P.Hoyles',
-    'M.Brassard',
-    'L.Wallin',
-    'J.Stenkvist',
-    'A.Ljungberg',
-    'K.Hedberg',
-    'N.Lindholm',
-    'J.Jonsson',
-    'R.Gimbel',
-    'T.Sten',
+    'A.Eriksson',
+    'A.Karlsson',
+    'A.Lundberg',
+    'A.Sahlberg',
+    'A.Sandberg',
+    'A.Wikstrom',
     'C.Aronsson',
-    'C.Barnett',
-    'K.Berggren',
-    'S.Strandberg',
-    'C.Bergman',
-    'S.Falk',
-    'L.Forsman',
-    'T.Soderlund',
-    'G.Olsson',
-    'H.Karlberg',
-    'K.Holmgren',
+    'C.Berglund',
+    'C.Bjorkman',
     'C.Eriksson',
-    'R.Svenningsson',
-    'T.Larsson',
-    'M.Hall',
-    'D.Sandstrom',
-    'C.Grass',
-    'G.Ekman',
-    'O.Karlsson',
-    'O.Nordberg',
-    'P.Nilson',
-    'E.Hansson',
-    'T.Bjork',
-    'S.Gunnarsson',
-    'E.Karlsson',
-    'L.Sundstrom',
+    'C.Forslund',
     'C.Lindholm',
-    'A.Nilson',
-    'W.Young',
+    'C.Mattsson',
+    'C.Sahlberg',
+    'C.Stenberg',
+    'C.Svanberg',
+    'C.Wahlberg',
+    'C.Wikstrom',
+    'D.Berglund',
+    'D.Forslund',
+    'D.Gothberg',
     'D.Sundberg',
-    'M.Le',
-    'A.Lindstrom',
-    'T.Wallin',
-    'H.Jansson',
-    'T.Laedre',
-    'P.Forslund',
-    'T.Jonsson',
-    'M.Lundberg',
-    'J.VanRooyen',
-    'K.Ekman',
-    'O.Berglund',
-    'I.Ackworth',
-    'M.Gustafsson',
-    'T.Dahl',
-    'O.Pettersson',
-    'A.Nyberg',
-    'J.Stahl',
-    'M.Choy',
-    'T.Lindberg',
-    'R.Lindgren',
-    'M.Ohlson',
-    'P.Andersson',
-    'R.Bjorkman',
-    'H.Nilsson',
-    'M.Nilson',
-    'M.Bagge',
-    'T.Mattsson',
-    'L.Olofsson',
-    'F.Bergqvist',
-    'F.Larsson',
-    'T.Kingston',
-    'H.Nilson',
-    'R.Sjodin',
-    'D.Rickard',
-    'R.Wikman',
-    'O.Svensson',
-    'N.Karlsen',
+    'E.Axelsson',
+    'E.Berglund',
+    'E.Douridas',
+    'E.Hellberg',
+    'E.Karlsson',
+    'F.Berglund',
+    'F.Lindblad',
+    'F.Lindblom',
+    'F.Lundberg',
     'F.Olofsson',
-    'J.Price',
-    'F.Berg',
-    'M.Bergqvist',
-    'P.Westman',
-    'O.Soderberg',
-    'F.Morales',
-    'K.Sjoberg',
-    'J.Hargelid',
-    'H.Holmgren',
-    'A.Holm',
-    'V.Lindholm',
-    'M.Crabtree',
-    'M.Fritze',
+    'F.Stenberg',
+    'G.Anderson',
     'G.Berglund',
-    'O.Berg',
-    'C.Mattsson',
-    'K.Norrman',
-    'O.Hallman',
-    'E.Berglund',
-    'C.Stenberg',
-    'T.Lundberg',
-    'C.Gustafsson',
-    'K.Westerberg',
-    'L.Karlsson',
-    'H.Forsman',
-    'M.Doran',
-    'R.Ekberg',
-    'M.Sahlberg',
+    'G.Eriksson',
     'G.Sahlgren',
-    'J.Hallman',
-    'A.Bjorklund',
-    'H.Wallin',
-    'T.Eriksson',
-    'H.Jonsson',
-    'J.Lindholm',
-    'V.Nilson',
-    'N.Fegraeus',
-    'J.Sandstrom',
-    'J.Persson',
-    'H.Bjorn',
-    'M.Hedberg',
-    'N.Goksu',
-    'A.Lundberg',
-    'E.Sjovold',
-    'S.Abdey',
-    'R.Karlsson',
-    'O.Lundberg',
-    'H.Ekberg',
-    'J.Evans',
-    'T.Gustavsson',
-    'F.Hellstrom',
-    'K.Nilsson',
-    'P.Ekberg',
-    'S.Hallberg',
-    'M.Westerlund',
-    'M.Cassidy',
-    'J.Bergstrom',
-    'J.Nord',
-    'B.Hedberg',
-    'V.Westerberg',
-    'M.Forsman',
-    'H.Kristiansson',
-    'R.Lindstrom',
-    'M.Nyholm',
-    'K.Hellman',
-    'L.Bjorkman',
-    'M.Eriksson',
-    'G.Johansson',
-    'J.Nilsson',
+    'G.Sandberg',
+    'G.Wikstrom',
+    'H.Forsgren',
+    'H.Holmgren',
+    'H.Karlberg',
+    'H.Karlsson',
     'H.Lindholm',
-    'L.Larsson',
-    'E.Hellberg',
-    'M.Forsberg',
+    'H.Sandberg',
+    'I.Ackworth',
+    'J.Berglund',
+    'J.Gonzales',
+    'J.Hargelid',
+    'J.Holmberg',
     'J.Holmgren',
-    'T.Gustafson',
-    'M.Andersson',
-    'N.Berggren',
-    'L.Stenberg',
-    'S.Karlstrom',
-    'R.Johansson',
-    'P.Wikstrom',
-    'A.Jansson',
-    'F.Lundberg',
-    'P.Eriksson',
-    'S.Magnusson',
-    'A.Johansson',
+    'J.Karlberg',
+    'J.Karlsson',
+    'J.Lindholm',
+    'J.Svensson',
+    'J.Wikstrom',
+    'K.Berggren',
     'K.Forsberg',
-    'L.Sandberg',
-    'T.Stenberg',
-    'T.Kristiansson',
-    'J.Nilson',
+    'K.Holmgren',
     'K.Lindgren',
-    'V.Forsman',
-    'A.Karlsson',
-    'A.Andersson',
+    'K.Lundberg',
+    'K.Stenlund',
+    'L.Bjorkman',
     'L.Castillo',
-    'O.Nilson',
+    'L.Ekstrand',
+    'L.Eriksson',
+    'L.Forsberg',
+    'L.Karlsson',
+    'L.Olofsson',
+    'L.Sandberg',
+    'L.Stenberg',
+    'L.Vikstrom',
+    'M.Anderson',
+    'M.Belanger',
+    'M.Brassard',
+    'M.Crabtree',
+    'M.Eriksson',
+    'M.Forsberg',
+    'M.Forslund',
+    'M.Hallberg',
+    'M.Hedstrom',
+    'M.Hornlund',
+    'M.Karlberg',
+    'M.Kylmamaa',
+    'M.Lindgren',
+    'M.Lindholm',
+    'M.Lundberg',
+    'M.Nordberg',
+    'M.Olofsson',
+    'M.Sahlberg',
+    'M.Stenlund',
+    'M.Svensson',
+    'M.Wallberg',
+    'N.Berggren',
+    'N.Fegraeus',
+    'N.Hornberg',
+    'N.Lindholm',
+    'N.Olofsson',
+    'O.Berglund',
+    'O.Eriksson',
+    'O.Hedstrom',
+    'O.Karlsson',
+    'O.Lindberg',
+    'O.Lindmark',
+    'O.Lundberg',
     'O.Malmgren',
-    'L.Martensson',
-    'S.Andersson',
-    'O.Gustavsson',
-    'V.Berglund',
-    'D.Gothberg',
-    'S.Nilsson',
-    'S.Karlsson',
-    'T.Soderman',
-    'S.Nilson',
-    'V.Nilsson',
-    'S.Ohlsson',
-    'G.Ohlson',
+    'O.Nordberg',
+    'O.Svensson',
+    'P.Anderson',
+    'P.Berglund',
+    'P.Eriksson',
+    'P.Forslund',
+    'P.Stenberg',
+    'P.Svensson',
+    'P.Wikander',
+    'P.Wikstrom',
+    'R.Bjorkman',
+    'R.Forsberg',
+    'R.Forsgren',
+    'R.Hellberg',
+    'R.Holmberg',
+    'R.Karlsson',
+    'R.Lindgren',
+    'R.Lindholm',
+    'R.Olofsson',
+    'R.Sahlberg',
+    'R.Smedberg',
+    'R.Stenlund',
+    'R.Wikstrom',
     'S.Anderson',
-    'M.Jonsson',
-    'R.Andersson',
-    'P.OShaughnessy',
-    'C.Strom',
-    'S.Olsson',
-    'A.Nilsson',
+    'S.Hallberg',
+    'S.Karlsson',
     'S.Lindgren',
-    'D.Berglund',
+    'S.Lindholm',
+    'S.Sandberg',
+    'S.Sjostrom',
+    'S.Wahlberg',
+    'T.Axelsson',
+    'T.Berglund',
+    'T.Eriksson',
+    'T.Forsberg',
+    'T.Holmsten',
+    'T.Karlsson',
+    'T.Kingston',
+    'T.Lindberg',
+    'T.Lindgren',
+    'T.Lundberg',
+    'T.Mattsson',
     'T.Sandberg',
-    'S.Flyte',
-    'S.Horn',
-    'K.Soderlund',
-    'L.Gustafsson',
+    'T.Soderman',
+    'T.Stenberg',
+    'T.Wikstrom',
+    'V.Berggren',
+    'V.Berglund',
+    'V.Lindholm',
+    'V.Stenlund',
     'V.Wikstrom',
-    'D.Forslund',
+    'A.Andersson',
+    'A.Bjorklund',
+    'A.Johansson',
+    'A.Lindstrom',
+    'A.Ljungberg',
+    'A.Nordstrom',
+    'C.Bergqvist',
+    'C.Johansson',
+    'C.Sandstrom',
+    'D.Sandstrom',
+    'E.Lindstrom',
+    'F.Bergqvist',
+    'F.Hellstrom',
+    'F.Liliegren',
+    'G.Andersson',
+    'G.Johansson',
+    'G.Nordstrom',
+    'G.Stromberg',
+    'H.Johansson',
     'H.Ljungberg',
-    'C.Wikstrom',
-    'J.Skarp',
-    'D.Kerr',
-    'A.Westerlund',
+    'H.Sandstrom',
+    'J.Andersson',
+    'J.Bergstrom',
+    'J.Sandstrom',
+    'J.Soderberg',
+    'J.Stenkvist',
+    'J.VanRooyen',
+    'K.Andersson',
+    'K.Bergqvist',
+    'K.Hegethorn',
+    'K.Lindqvist',
+    'K.Soderlund',
+    'K.Stromberg',
+    'L.Hellstrom',
+    'L.Johansson',
+    'L.Kjellberg',
+    'L.Sandstrom',
+    'L.Sundstrom',
+    'M.Andersson',
+    'M.Bergkvist',
+    'M.Bergqvist',
+    'M.Gustafson',
+    'M.Johansson',
+    'M.Kopparhed',
+    'M.Lindqvist',
+    'M.Sandstrom',
+    'M.Soderberg',
+    'N.Bergquist',
+    'N.Bergstrom',
+    'N.Hellstrom',
+    'N.Soderberg',
+    'N.Wallstrom',
+    'O.Johansson',
+    'O.Lindstrom',
+    'O.Soderberg',
+    'O.Stromberg',
+    'P.Andersson',
+    'P.Bjorklund',
+    'P.Jakobsson',
+    'P.Soderlund',
+    'R.Andersson',
+    'R.Bjorklund',
+    'R.Johansson',
+    'R.Lindstrom',
     'R.Stromberg',
+    'S.Andersson',
+    'S.Bergstrom',
+    'S.Johansson',
+    'S.Karlstrom',
+    'S.Lindqvist',
+    'S.Lindstrom',
+    'S.Magnusson',
+    'S.Parkinson',
+    'S.Pinkerton',
+    'T.Andersson',
+    'T.Bjornlund',
+    'T.Gustafson',
+    'T.Jakobsson',
+    'T.Lindqvist',
+    'T.Soderlund',
+    'V.Andersson',
+    'V.Nordstrom',
+    'V.Soderlund',
+    'A.Gustafsson',
+    'A.Westerberg',
+    'A.Westerlund',
+    'C.Gustafsson',
+    'E.Westerlund',
+    'F.Martensson',
+    'H.Fredrikson',
+    'H.Gustafsson',
+    'J.Gustavsson',
+    'J.Kjellstrom',
+    'K.Stefansson',
+    'K.Westerberg',
+    'L.Gustafsson',
+    'L.Gustavsson',
+    'L.Martensson',
+    'L.Westerlund',
+    'M.Gustafsson',
+    'M.Henriksson',
+    'M.Westerberg',
+    'M.Westerlund',
+    'N.Stromquist',
+    'O.Gustavsson',
+    'O.Pettersson',
+    'O.Westerlund',
+    'P.Soderstrom',
+    'R.Gustafsson',
+    'S.Gunnarsson',
+    'S.Pettersson',
+    'S.Strandberg',
+    'T.Gustavsson',
+    'T.Westerlund',
+    'V.Westerberg',
+    'A.Fredriksson',
     'M.Fredriksson',
-}
+    'P.K.Johansson',
+    'T.Fredriksson',
+    'A.Gottfridsson',
+    'B.Kristiansson',
+    'H.Kristiansson',
+    'P.OShaughnessy',
+    'R.Svenningsson',
+    'T.Kristiansson',
+)
+
+
+@functools.lru_cache(maxsize=None)
+def get_name_lengths() -> Tuple[int, ...]:
+    return tuple(len(name) for name in AI_NAMES)
+
+
+def get_ai_names(max_length: int = 16) -> Tuple[str, ...]:
+    return AI_NAMES[:bisect.bisect_right(get_name_lengths(), max_length)]
+
+
+def sample_ai_names(exclude: Set[str], seed: int = 0, max_length: int = 16) -> Generator[str, None, None]:
+    names = get_ai_names(max_length)
+    count = len(names)
+    if count == 0:
+        return
+
+    # Walk the names in a seeded pseudo-random order (an affine permutation of their indices), which is
+    # reproducible across processes unlike set iteration order and needs no shuffled copy of the corpus
+    rng = random.Random(seed)
+    step = rng.randrange(1, count) if count > 1 else 1
+    while math.gcd(step, count) != 1:
+        step = rng.randrange(1, count)
+    offset = rng.randrange(count)
+
+    for i in range(count):
+        name = names[(offset + i * step) % count]
+        if name not in exclude:
+            yield name
@@ -0,0 +1,71 @@
+import argparse
+import getpass
+import os
+import pathlib
+import sys
+from typing import List
+
+from scripts.accounts import DatabaseBackend, DatabaseTarget
+from scripts.config import load_yaml
+
+
+def add_target_parsers(subparsers, action: str) -> List[argparse.ArgumentParser]:
+    mysqlParser = subparsers.add_parser(DatabaseBackend.MySQL)
+    mysqlParser.add_argument('--host', help='MySQL hostname/ip address', type=str, required=True)
+    mysqlParser.add_argument('--port', help='MySQL listen port', type=int, default=3306)
+    mysqlParser.add_argument('--user', help='MySQL user to login as', type=str, required=True)
+    mysqlParser.add_argument('--database', help=f'MySQL database to {action}', required=True)
+    sqliteParser = subparsers.add_parser(DatabaseBackend.SQLite)
+    sqliteParser.add_argument('--database', help='Path to SQLite database file', required=True)
+    targetsParser = subparsers.add_parser('targets', help=f'{action.capitalize()} all MySQL/SQLite databases '
+                                                          f'listed in a file')
+    targetsParser.add_argument('--file', help='Path to database targets file (yaml)', type=str, required=True)
+
+    return [mysqlParser, sqliteParser, targetsParser]
+
+
+def load_targets(targets_path: pathlib.Path) -> List[DatabaseTarget]:
+    if not os.path.isfile(targets_path):
+        print(f'Could not find targets file at given path ({targets_path})')
+        sys.exit(1)
+
+    # An empty file parses to None rather than an empty list
+    parsed_targets = load_yaml(targets_path) or list()
+    if not isinstance(parsed_targets, list):
+        print(f'Targets file must contain a list of database targets ({targets_path})')
+        sys.exit(1)
+    if len(parsed_targets) == 0:
+        print(f'Targets file does not list any database targets ({targets_path})')
+        sys.exit(1)
+
+    try:
+        return [DatabaseTarget.load(parsed) for parsed in parsed_targets]
+    except ValueError:
+        print('Unknown database backend type')
+        sys.exit(1)
+
+
+def ask_for_passwords(targets: List[DatabaseTarget]) -> None:
+    # Ask for any missing passwords up front, we cannot prompt once we are working on targets in parallel
+    for target in targets:
+        if target.backend is DatabaseBackend.MySQL and target.password is None:
+            target.password = getpass.getpass(f'Please enter the mysql password for "{target.user}" ({target}): ')
+
+
+def get_targets(args: argparse.Namespace) -> List[DatabaseTarget]:
+    if args.backend == 'targets':
+        targets = load_targets(pathlib.Path(args.file).absolute())
+    else:
+        try:
+            backend = DatabaseBackend(args.backend)
+        except ValueError:
+            print('Unknown database backend type')
+            sys.exit(1)
+
+        if backend is DatabaseBackend.MySQL:
+            targets = [DatabaseTarget(backend, args.database, host=args.host, port=args.port, user=args.user)]
+        else:
+            targets = [DatabaseTarget(backend, args.database)]
+
+    ask_for_passwords(targets)
+    return targets
@@ -0,0 +1,356 @@
+import hashlib
+import os
+import pathlib
+import pickle
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Generator, List, Optional, Tuple, Union
+
+import yaml
+
+from scripts.types import ServerConfig
+
+# Use libyaml based loader/dumper if available, they are a lot faster than the pure-Python implementations
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+# Bump whenever ServerConfig/BotConfig change in a way that makes previously pickled configs unusable
+CACHE_VERSION = 6
+
+# Config directories contain an index of all servers and one config file per server
+INDEX_FILE_NAME = 'index.yaml'
+SERVERS_DIR_NAME = 'servers'
+
+
+@dataclass
+class ConfigSegment:
+    # Source text of a single server entry (including the leading "- ") and the data it was parsed into.
+    # Text is None if the entry cannot be spliced (flow style), requiring it to be dumped again when saving.
+    text: Optional[str]
+    data: dict
+    # Comments and blank lines above the entry (part of text), kept when the entry has to be dumped again
+    leading: str = ''
+
+
+class ConfigFile:
+    path: pathlib.Path
+    configs: List[ServerConfig]
+    prefix: str
+
+    # Original source of every server config loaded from file, keyed by the config object's id
+    segments: Dict[int, ConfigSegment]
+    # Keep loaded configs alive, so their ids cannot be reused by new configs
+    loaded: List[ServerConfig]
+
+    def __init__(self, path: pathlib.Path, configs: List[ServerConfig], prefix: str = '',
+                 segments: Optional[List[ConfigSegment]] = None):
+        self.path = path
+        self.configs = configs
+        self.prefix = prefix
+        self.loaded = list(configs)
+        self.segments = {
+            id(config): segment
+            for (config, segment) in zip(self.loaded, segments or list())
+            if segment is not None
+        }
+
+    @staticmethod
+    def load(path: pathlib.Path, use_cache: bool = True) -> 'ConfigFile':
+        if use_cache:
+            cached = read_cache(path)
+            if cached is not None:
+                configs, prefix, segments = cached
+                return ConfigFile(path, configs, prefix, segments)
+
+        with open(path, 'r') as configFile:
+            text = configFile.read()
+        configs, prefix, segments = parse_config_text(text)
+
+        if use_cache:
+            write_cache(path, (configs, prefix, segments))
+
+        return ConfigFile(path, configs, prefix, segments)
+
+    def get_segment(self, config: ServerConfig) -> Optional[ConfigSegment]:
+        return self.segments.get(id(config))
+
+    def get_data(self, config: ServerConfig) -> Any:
+        # Loading fills in defaults for missing values, so use what is actually in the file unless the config changed
+        segment = self.segments.get(id(config))
+        if segment is not None and ServerConfig.load(segment.data) == config:
+            return segment.data
+        return config.dump()
+
+    def find(self, address: str, port: int) -> Optional[ServerConfig]:
+        return next((config for config in self.configs if config.address == address and config.port == port), None)
+
+    def add(self, config: ServerConfig) -> None:
+        self.configs.append(config)
+
+    def is_modified(self) -> bool:
+        if [id(config) for config in self.configs] != [id(config) for config in self.loaded]:
+            return True
+        return any(
+            id(config) not in self.segments or self.segments[id(config)].data != config.dump()
+            for config in self.configs
+        )
+
+    def save(self, use_cache: bool = True) -> None:
+        with self.staged_save(use_cache):
+            pass
+
+    @contextmanager
+    def staged_save(self, use_cache: bool = True) -> Generator[None, None, None]:
+        # Only re-serialize servers that were added or changed, copy everything else from the original file as is
+        parts = [self.prefix]
+        segments = []
+        for config in self.configs:
+            data = config.dump()
+            segment = self.segments.get(id(config))
+            if segment is None or segment.text is None or segment.data != data:
+                leading = segment.leading if segment is not None else ''
+                segment = ConfigSegment(leading + yaml.dump([data], Dumper=SafeDumper, sort_keys=False), data, leading)
+            parts.append(segment.text)
+            segments.append(segment)
+
+        with staged_write(self.path, ''.join(parts)):
+            yield
+
+        self.loaded = list(self.configs)
+        self.segments = {id(config): segment for (config, segment) in zip(self.loaded, segments)}
+        if use_cache:
+            write_cache(self.path, (self.configs, self.prefix, segments))
+
+
+@dataclass
+class IndexEntry:
+    file: str
+    name: str
+    address: str
+    port: int
+
+    @staticmethod
+    def load(data: dict) -> 'IndexEntry':
+        return IndexEntry(
+            file=data.get('file', str()),
+            name=data.get('name', str()),
+            address=data.get('address', str()),
+            port=data.get('port', int())
+        )
+
+    def dump(self) -> dict:
+        return {
+            'file': self.file,
+            'name': self.name,
+            'address': self.address,
+            'port': self.port
+        }
+
+
+class ConfigDirectory:
+    path: pathlib.Path
+    use_cache: bool
+    entries: List[IndexEntry]
+
+    # Server config files are only loaded once they are needed, keyed by their path relative to the directory
+    files: Dict[str, ConfigFile]
+    lookup: Dict[Tuple[str, int], IndexEntry]
+
+    def __init__(self, path: pathlib.Path, entries: List[IndexEntry], use_cache: bool = True):
+        self.path = path
+        self.use_cache = use_cache
+        self.entries = entries
+        self.files = dict()
+        self.lookup = {(entry.address, entry.port): entry for entry in entries}
+
+    @staticmethod
+    def load(path: pathlib.Path, use_cache: bool = True) -> 'ConfigDirectory':
+        index = load_yaml(path.joinpath(INDEX_FILE_NAME)) or list()
+        return ConfigDirectory(path, [IndexEntry.load(entry) for entry in index], use_cache)
+
+    @staticmethod
+    def split(config_file: ConfigFile, path: pathlib.Path) -> 'ConfigDirectory':
+        directory = ConfigDirectory(path, [])
+        for config in config_file.configs:
+            directory.add(config, config_file.get_segment(config))
+        return directory
+
+    @property
+    def configs(self) -> List[ServerConfig]:
+        return [self.get(entry) for entry in self.entries]
+
+    def get(self, entry: IndexEntry) -> ServerConfig:
+        file = self.files.get(entry.file)
+        if file is None:
+            file = ConfigFile.load(self.path.joinpath(entry.file), self.use_cache)
+            self.files[entry.file] = file
+        return file.configs[0]
+
+    def find(self, address: str, port: int) -> Optional[ServerConfig]:
+        entry = self.lookup.get((address, port))
+        return self.get(entry) if entry is not None else None
+
+    def add(self, config: ServerConfig, segment: Optional[ConfigSegment] = None) -> None:
+        # Address and port identify a server, so they make for stable file names (unlike the server's name)
+        file = f'{SERVERS_DIR_NAME}/{config.address}_{config.port}.yaml'
+        entry = IndexEntry(file, config.name, config.address, config.port)
+        self.entries.append(entry)
+        self.lookup[(entry.address, entry.port)] = entry
+        self.files[file] = ConfigFile(self.path.joinpath(file), [config], segments=[segment])
+
+    def get_segment(self, config: ServerConfig) -> Optional[ConfigSegment]:
+        entry = self.lookup.get((config.address, config.port))
+        file = self.files.get(entry.file) if entry is not None else None
+        return file.get_segment(config) if file is not None else None
+
+    def get_data(self, config: ServerConfig) -> Any:
+        entry = self.lookup.get((config.address, config.port))
+        file = self.files.get(entry.file) if entry is not None else None
+        return file.get_data(config) if file is not None else config.dump()
+
+    def flatten(self, path: pathlib.Path) -> ConfigFile:
+        configs = self.configs
+        return ConfigFile(path, configs, segments=[self.get_segment(config) for config in configs])
+
+    def save(self, use_cache: bool = True) -> None:
+        with self.staged_save(use_cache):
+            pass
+
+    @contextmanager
+    def staged_save(self, use_cache: bool = True) -> Generator[None, None, None]:
+        # Servers may have been renamed, but never moved to another address/port (which would make them a new server)
+        for entry in self.entries:
+            if entry.file in self.files:
+                entry.name = self.files[entry.file].configs[0].name
+        index = yaml.dump([entry.dump() for entry in self.entries], Dumper=SafeDumper, sort_keys=False)
+
+        # Only write server files which were added or changed, all others remain untouched
+        self.path.joinpath(SERVERS_DIR_NAME).mkdir(parents=True, exist_ok=True)
+        with ExitStack() as stack:
+            for file in self.files.values():
+                if file.is_modified() or not os.path.exists(file.path):
+                    stack.enter_context(file.staged_save(use_cache))
+            stack.enter_context(staged_write(self.path.joinpath(INDEX_FILE_NAME), index))
+            yield
+
+
+@contextmanager
+def staged_write(path: pathlib.Path, text: str) -> Generator[None, None, None]:
+    # Write to a temporary file next to the target and swap it in, so the target is never left half-written.
+    # Swapping only happens if the block exits without error, allowing callers to tie other changes to the write.
+    temp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    try:
+        with open(temp_path, 'w') as file:
+            file.write(text)
+        yield
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def open_config(path: pathlib.Path, use_cache: bool = True) -> Union[ConfigFile, ConfigDirectory]:
+    if os.path.isdir(path):
+        return ConfigDirectory.load(path, use_cache)
+    return ConfigFile.load(path, use_cache)
+
+
+def parse_config_text(text: str) -> Tuple[List[ServerConfig], str, List[ConfigSegment]]:
+    loader = SafeLoader(text)
+    try:
+        node = loader.get_single_node()
+        data = loader.construct_document(node) if node is not None else None
+    finally:
+        loader.dispose()
+
+    configs = [ServerConfig.load(parsed) for parsed in data or list()]
+
+    # Entries can only be spliced if they are laid out one after another, which is not the case for flow style
+    if not isinstance(node, yaml.SequenceNode) or node.flow_style or len(node.value) == 0:
+        return configs, '', [ConfigSegment(None, parsed) for parsed in data or list()]
+
+    # Split the text after the last line of each entry's content, so comments above an entry remain part of it.
+    # The first entry starts at the line containing its "-" indicator, anything above it is part of the prefix.
+    starts = []
+    boundaries = []
+    for item in node.value:
+        dash = text.rfind('-', 0, item.start_mark.index)
+        starts.append(text.rfind('\n', 0, dash) + 1)
+        boundaries.append(get_line_end(text, get_content_end(item)))
+    boundaries = [starts[0], *boundaries[:-1], len(text)]
+
+    segments = []
+    for (i, parsed) in enumerate(data):
+        segment = text[boundaries[i]:boundaries[i + 1]]
+        leading = text[boundaries[i]:max(starts[i], boundaries[i])]
+        segments.append(ConfigSegment(segment if segment.endswith('\n') else segment + '\n', parsed, leading))
+
+    return configs, text[:boundaries[0]], segments
+
+
+def get_content_end(node: yaml.Node) -> int:
+    # Block collections only end where the next token starts (after any comments), so use the end of their last value
+    while isinstance(node, (yaml.MappingNode, yaml.SequenceNode)) and not node.flow_style and len(node.value) > 0:
+        node = node.value[-1][1] if isinstance(node, yaml.MappingNode) else node.value[-1]
+    return node.end_mark.index
+
+
+def get_line_end(text: str, index: int) -> int:
+    if index > 0 and text[index - 1] == '\n':
+        return index
+    end = text.find('\n', index)
+    return end + 1 if end != -1 else len(text)
+
+
+def get_cache_dir() -> pathlib.Path:
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(pathlib.Path.home(), '.cache')
+    return pathlib.Path(base).joinpath('bf2-bot-manager')
+
+
+def get_cache_path(config_path: pathlib.Path) -> pathlib.Path:
+    digest = hashlib.sha1(str(config_path).encode()).hexdigest()
+    return get_cache_dir().joinpath(f'config-{digest}.pickle')
+
+
+def get_cache_key(config_path: pathlib.Path) -> Tuple[int, str, int, int]:
+    stat = os.stat(config_path)
+    return CACHE_VERSION, str(config_path), stat.st_mtime_ns, stat.st_size
+
+
+def read_cache(config_path: pathlib.Path) -> Optional[Any]:
+    try:
+        with open(get_cache_path(config_path), 'rb') as cacheFile:
+            key, cached = pickle.load(cacheFile)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, TypeError, ValueError):
+        return None
+
+    return cached if key == get_cache_key(config_path) else None
+
+
+def write_cache(config_path: pathlib.Path, cached: Any) -> None:
+    cache_path = get_cache_path(config_path)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first, so parallel runs never read a partially written cache
+        temp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(temp_path, 'wb') as cacheFile:
+            pickle.dump((get_cache_key(config_path), cached), cacheFile, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        # Cache is purely an optimization, not being able to write it is fine
+        pass
+
+
+def load_yaml(path: pathlib.Path) -> Any:
+    with open(path, 'r') as file:
+        return yaml.load(file, SafeLoader)
+
+
+def load_configs(config_path: pathlib.Path, use_cache: bool = True) -> List[ServerConfig]:
+    return open_config(config_path, use_cache).configs
+
+
+def dump_configs(configs: List[ServerConfig], config_path: pathlib.Path, use_cache: bool = True) -> None:
+    ConfigFile(config_path, configs).save(use_cache)
@@ -0,0 +1,34 @@
+import argparse
+import os
+import pathlib
+import sys
+
+from scripts.config import ConfigDirectory, ConfigFile
+
+parser = argparse.ArgumentParser(description='Convert between single config file (as read by the manager) '
+                                             'and config directory (one file per server)')
+parser.add_argument('--input', help='Path to config file or config directory to convert', type=str, required=True)
+parser.add_argument('--output', help='Path to write converted config to (a directory if input is a file, '
+                                     'else a file)', type=str, required=True)
+parser.add_argument('--no-cache', help='Always parse config file instead of using cached, previously parsed config',
+                    dest='cache', action='store_false')
+args = parser.parse_args()
+
+inputPath = pathlib.Path(args.input).absolute()
+outputPath = pathlib.Path(args.output).absolute()
+if not os.path.exists(inputPath):
+    print(f'Could not find config at given path ({inputPath})')
+    sys.exit(1)
+
+if os.path.isdir(inputPath):
+    directory = ConfigDirectory.load(inputPath, use_cache=args.cache)
+    configFile = directory.flatten(outputPath)
+    configFile.save(use_cache=args.cache)
+    print(f'Flattened {len(configFile.configs)} server configs into {outputPath}')
+else:
+    if os.path.exists(outputPath) and (not os.path.isdir(outputPath) or len(os.listdir(outputPath)) > 0):
+        print(f'Output path already exists and is not an empty directory ({outputPath})')
+        sys.exit(1)
+    directory = ConfigDirectory.split(ConfigFile.load(inputPath, use_cache=args.cache), outputPath)
+    directory.save(use_cache=args.cache)
+    print(f'Split {len(directory.entries)} server configs into {outputPath}')
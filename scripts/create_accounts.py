@@ -1,121 +1,144 @@
 import argparse
-import getpass
 import os
 import pathlib
-import sqlite3
 import sys
-from enum import Enum
-from typing import List
-
-import mysql.connector
-import yaml
-
-from scripts.types import ServerConfig
-
-
-class DatabaseBackend(str, Enum):
-    MySQL = 'mysql'
-    SQLite = 'sqlite'
-
-
-def prepare_statement(table: str, columns: List[str], backend: DatabaseBackend) -> str:
-    if backend is DatabaseBackend.MySQL:
-        placeholders = [f'%({c})s' for c in columns]
-    else:
-        placeholders = [f':{c}' for c in columns]
-
-    return f'INSERT INTO {table} ({", ".join(columns)}) VALUES ({", ".join(placeholders)})'
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+from scripts.accounts import DatabaseTarget, ExportFormat, ProvisioningResult, FIRST_PID, \
+    build_accounts, connect, export_rows, iter_account_rows, iter_accounts, provision
+from scripts.cli import add_target_parsers, get_targets
+from scripts.config import open_config
+from scripts.journal import ProvisioningJournal
+from scripts.stats import Stats, print_stats
+from scripts.validation import validate_config_file
+
+
+def provision_target(target: DatabaseTarget, accounts: List[Tuple[str, str]], batch_size: int,
+                     bulk_load: bool, resume: bool) -> ProvisioningResult:
+    # Each target gets its own connection, since connections must not be shared between threads
+    start = time.perf_counter()
+    stats = Stats()
+    journal = ProvisioningJournal.load(ProvisioningJournal.get_default_path(str(target)), str(target))
+    if journal.exists() and not resume:
+        # Starting over would leave the pids reserved by the interrupted run unused
+        return ProvisioningResult(failed=len(accounts), error=f'Found journal of an interrupted run, continue it using '
+                                                              f'--resume or delete it to start over ({journal.path})',
+                                  stats=stats)
+
+    try:
+        with stats.span('connect'):
+            store = connect(target, bulk_load)
+    except Exception as e:
+        return ProvisioningResult(failed=len(accounts), elapsed=time.perf_counter() - start, error=str(e),
+                                  stats=stats)
+
+    store.stats = stats
+    try:
+        return provision(store, accounts, batch_size, bulk_load, journal)
+    except Exception as e:
+        stats.count(f'errors.{type(e).__name__}')
+        return ProvisioningResult(failed=len(accounts), elapsed=time.perf_counter() - start, error=str(e),
+                                  stats=stats)
+    finally:
+        store.close()
+
+
+def dump_result(target: DatabaseTarget, result: ProvisioningResult) -> dict:
+    return {
+        'target': str(target),
+        'inserted': result.inserted,
+        'skipped': result.skipped,
+        'failed': result.failed,
+        'elapsed': result.elapsed,
+        'error': result.error,
+        **(result.stats.dump() if result.stats is not None else dict())
+    }
 
 
 parser = argparse.ArgumentParser(description='Generate bot accounts in MySQL/SQLite table')
-parser.add_argument('--config', help='Path to bot server configs (config.yaml)', type=str, required=True)
+parser.add_argument('--config', help='Path to bot server configs (config.yaml or config directory)', type=str,
+                    required=True)
+parser.add_argument('--no-cache', help='Always parse config file instead of using cached, previously parsed config',
+                    dest='cache', action='store_false')
+parser.add_argument('--overpopulate-factor', help='Factor the manager uses to determine how many bots may be launched '
+                                                  'beyond the desired slot count', type=int, default=2)
+parser.add_argument('--batch-size', help='Number of accounts to add per transaction', type=int, default=500)
+parser.add_argument('--stats', help='Print phase durations, row counts and statement latencies as JSON once done',
+                    action='store_true')
 subparsers = parser.add_subparsers(title='Database backend type', dest='backend', required=True)
-mysqlParser = subparsers.add_parser(DatabaseBackend.MySQL)
-mysqlParser.add_argument('--host', help='MySQL hostname/ip address', type=str, required=True)
-mysqlParser.add_argument('--port', help='MySQL listen port', type=int, default=3306)
-mysqlParser.add_argument('--user', help='MySQL user to login as', type=str, required=True)
-mysqlParser.add_argument('--database', help='MySQL database to add accounts to', required=True)
-sqliteParser = subparsers.add_parser(DatabaseBackend.SQLite)
-sqliteParser.add_argument('--database', help='Path to SQLite database file', required=True)
+databaseParsers = add_target_parsers(subparsers, 'add accounts to')
+mysqlParser, sqliteParser, targetsParser = databaseParsers
+targetsParser.add_argument('--workers', help='Number of databases to add accounts to in parallel', type=int)
+for databaseParser in databaseParsers:
+    databaseParser.add_argument('--bulk-load', help='Add accounts using the database\'s bulk loading mechanism '
+                                                    '(LOAD DATA LOCAL INFILE for MySQL)', action='store_true')
+    databaseParser.add_argument('--resume', help='Continue an interrupted run where it stopped, re-using the pids '
+                                                 'it reserved', action='store_true')
+exportParser = subparsers.add_parser('export',
+                                     help='Write accounts to a CSV/SQL file instead of adding them to a database')
+exportParser.add_argument('--output', help='Path to write accounts to', type=str, required=True)
+exportParser.add_argument('--format', help='Format to write accounts in (SQL statements are written for MySQL)',
+                          type=ExportFormat, default=ExportFormat.CSV)
+exportParser.add_argument('--first-pid', help='Pid to assign to first account', type=int, default=FIRST_PID)
 
 args = parser.parse_args()
 
 configPath = pathlib.Path(args.config).absolute()
-if not os.path.isfile(configPath):
+if not os.path.exists(configPath):
     print(f'Could not find config file at given path ({configPath})')
     sys.exit(1)
 
-with open(configPath, 'r') as configFile:
-    configs = [ServerConfig.load(parsed) for parsed in yaml.load(configFile, yaml.Loader)]
+stats = Stats()
+with stats.span('load_config'):
+    configFile = open_config(configPath, use_cache=args.cache)
+    configs = configFile.configs
 
-bots = [bot for server in configs for bot in server.bots]
-
-try:
-    backend = DatabaseBackend(args.backend)
-except ValueError:
-    print('Unknown database backend type')
+with stats.span('validate'):
+    errors = validate_config_file(configFile, args.overpopulate_factor)
+if len(errors) > 0:
+    print(f'Config file is invalid ({len(errors)} error(s)):')
+    print('\n'.join(errors))
     sys.exit(1)
 
-if backend is DatabaseBackend.MySQL:
-    password = getpass.getpass(f'Please enter the mysql password for "{args.user}": ')
-
-    connection = mysql.connector.connect(
-        host=args.host,
-        port=args.port,
-        user=args.user,
-        passwd=password,
-        database=args.database
-    )
-    cursor = connection.cursor(dictionary=True)
-else:
-    connection = sqlite3.connect(args.database)
-    connection.row_factory = sqlite3.Row
-
-    cursor = connection.cursor()
-
-# Get last pid
-sql = 'SELECT id FROM accounts ORDER BY id DESC LIMIT 1'
-cursor.execute(sql)
-results = cursor.fetchall()
-
-lastPid = results.pop()['id'] if len(results) > 0 else 50000000
-
-errors = 0
-for bot in bots:
-    # Name must be leave space for 2 character name suffix ("^{number}")
-    if len(bot.basename) > 16:
-        print(f'Name "{bot.basename}" is too long (15 characters max.), skipping name')
-
-    for i in range(0, 16):
-        lastPid += 1
-        name = f'{bot.basename}^{i:x}'
-        sql = prepare_statement(
-            'accounts',
-            ['id', 'name', 'password', 'email', 'country'],
-            backend
-        )
-        try:
-            cursor.execute(sql, {
-                'id': lastPid,
-                'name': name,
-                'password': bot.password,
-                'email': 'bla@bla.com',
-                'country': 'DE'
-            })
-            connection.commit()
-        except mysql.connector.errors.Error as e:
-            if 'Duplicate entry' not in str(e):
-                print(e)
-                errors += 1
-        except sqlite3.IntegrityError as e:
-            if 'UNIQUE constraint failed' not in str(e):
-                print(e)
-                errors += 1
-
-if errors == 0:
+if args.backend == 'export':
+    # Stream rows straight from the config to the file, there is no database to compare against anyway
+    start = time.perf_counter()
+    with stats.span('export'), open(args.output, 'w', newline='') as outputFile:
+        count = export_rows(iter_account_rows(iter_accounts(configs), args.first_pid), outputFile, args.format,
+                            args.batch_size)
+    elapsed = time.perf_counter() - start
+    stats.count('rows.exported', count)
+    print(f'Wrote {count} accounts to {args.output} in {elapsed:.2f}s ({count / max(elapsed, 1e-6):.0f} rows/s)')
+    if args.stats:
+        print_stats(stats.dump())
+    sys.exit(0)
+
+targets = get_targets(args)
+
+with stats.span('build_accounts'):
+    accounts = build_accounts(configs)
+
+workers = getattr(args, 'workers', None) or len(targets)
+with stats.span('provision'), ThreadPoolExecutor(max_workers=workers) as executor:
+    results = list(executor.map(
+        lambda t: provision_target(t, accounts, args.batch_size, args.bulk_load, args.resume), targets
+    ))
+
+for target, result in zip(targets, results):
+    print(f'{target}: added {result.inserted}, skipped {result.skipped} (existing), failed {result.failed} '
+          f'in {result.elapsed:.2f}s ({result.inserted / max(result.elapsed, 1e-6):.0f} rows/s)')
+    if result.error is not None:
+        print(f'{target}: {result.error}')
+
+if all(result.failed == 0 for result in results):
     print('Added all accounts listed in config')
 else:
-    print('Failed to add some accounts')
+    print('Failed to add some accounts, run again with --resume to retry them')
 
-cursor.close()
-connection.close()
+if args.stats:
+    print_stats({
+        **stats.dump(),
+        'targets': [dump_result(target, result) for target, result in zip(targets, results)]
+    })
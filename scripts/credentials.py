@@ -0,0 +1,25 @@
+import secrets
+import string
+from typing import List
+
+ALPHABET = string.ascii_letters + string.digits
+
+
+def generate_passwords(count: int, length: int = 10, alphabet: str = ALPHABET) -> List[str]:
+    needed = count * length
+    # Bytes at or above the largest multiple of the alphabet size would favour the first characters, so reject them
+    limit = 256 - 256 % len(alphabet)
+
+    chars: List[str] = []
+    while len(chars) < needed:
+        # Draw randomness for all passwords at once, with some headroom for rejected bytes
+        missing = needed - len(chars)
+        drawn = secrets.token_bytes(missing + missing // 16 + 16)
+        chars.extend(alphabet[b % len(alphabet)] for b in drawn if b < limit)
+
+    joined = ''.join(chars[:needed])
+    return [joined[i:i + length] for i in range(0, needed, length)]
+
+
+def generate_password(length: int = 10) -> str:
+    return generate_passwords(1, length)[0]
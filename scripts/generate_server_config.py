@@ -1,28 +1,163 @@
 import argparse
+import csv
 import ipaddress
+import itertools
 import os
 import pathlib
 import secrets
-import string
 import sys
-from enum import Enum
-from typing import Any, Generator, List
-
-import requests
-import yaml
+from dataclasses import dataclass
+from typing import Any, Iterator, List, Optional, Set, Union
 
+from scripts.config import ConfigDirectory, ConfigFile, load_yaml, open_config
+from scripts.credentials import generate_password
+from scripts.names import BotNameSource, GLITCH_API_URL, NamePool, generate_bot_names_via_glitch_api
+from scripts.query import DEFAULT_QUERY_PORTS, discover_query_ports, parse_port_range
+from scripts.stats import Stats, print_stats
 from scripts.types import ServerConfig, BotConfig
+from scripts.validation import validate_config_file
+
+MANIFEST_REQUIRED_KEYS = ['name', 'address', 'port', 'slots', 'reservedSlots']
+MANIFEST_OPTIONAL_KEYS = ['mod', 'overpopulateFactor', 'queryPort', 'autobalance', 'queryDirectly', 'rotateBotNames',
+                          'botNameSuffixes']
+
+
+@dataclass
+class ServerSpec:
+    name: str
+    address: str
+    port: int
+    slots: int
+    reserved_slots: int
+    mod: str = 'bf2'
+    overpopulate_factor: int = 2
+    query_port: Optional[int] = None
+    autobalance: Optional[bool] = None
+    query_directly: Optional[bool] = None
+    rotate_bot_names: Optional[bool] = None
+    bot_name_suffixes: Optional[int] = None
+
+    @staticmethod
+    def load(data: dict, overpopulate_factor: int) -> 'ServerSpec':
+        # Values read from CSV manifests are all strings, with empty strings for omitted values
+        data = {key: value for (key, value) in data.items() if value != ''}
+
+        # Never fill in defaults for misspelled/missing keys, that would silently write a broken config
+        problems = []
+        missing = [key for key in MANIFEST_REQUIRED_KEYS if key not in data]
+        if len(missing) > 0:
+            problems.append(f'missing required key(s): {", ".join(missing)}')
+        unknown = [str(key) for key in data if key not in MANIFEST_REQUIRED_KEYS + MANIFEST_OPTIONAL_KEYS]
+        if len(unknown) > 0:
+            problems.append(f'unknown key(s): {", ".join(unknown)}')
+        if len(problems) > 0:
+            raise ValueError('; '.join(problems))
+
+        return ServerSpec(
+            name=str(data.get('name', str())),
+            address=str(data.get('address', str())),
+            port=int(data.get('port', int())),
+            slots=int(data.get('slots', int())),
+            reserved_slots=int(data.get('reservedSlots', int())),
+            mod=str(data.get('mod', 'bf2')),
+            overpopulate_factor=int(data.get('overpopulateFactor', overpopulate_factor)),
+            query_port=parse_optional(data.get('queryPort'), int),
+            autobalance=parse_optional(data.get('autobalance'), parse_bool),
+            query_directly=parse_optional(data.get('queryDirectly'), parse_bool),
+            rotate_bot_names=parse_optional(data.get('rotateBotNames'), parse_bool),
+            bot_name_suffixes=parse_optional(data.get('botNameSuffixes'), int)
+        )
 
-ALPHABET = string.ascii_letters + string.digits
+    @property
+    def mod_path(self) -> str:
+        return self.mod if self.mod.startswith('mods/') else f'mods/{self.mod}'
 
 
-class BotNameSource(str, Enum):
-    GlitchAPI = "glitch.me"
-    AINames = "ai-names"
+def parse_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() in ['true', 'yes', '1']
 
 
-def generate_password(length: int = 10) -> str:
-    return ''.join(secrets.choice(ALPHABET) for i in range(length))
+def parse_optional(value: Any, parse: Any) -> Any:
+    return parse(value) if value is not None else None
+
+
+def load_manifest(manifest_path: pathlib.Path, overpopulate_factor: int) -> List[ServerSpec]:
+    if manifest_path.suffix.lower() == '.csv':
+        with open(manifest_path, 'r', newline='') as manifestFile:
+            entries = list(csv.DictReader(manifestFile))
+    else:
+        entries = load_yaml(manifest_path) or list()
+
+    specs = []
+    for (i, entry) in enumerate(entries):
+        try:
+            specs.append(ServerSpec.load(entry, overpopulate_factor))
+        except (ValueError, TypeError, AttributeError) as e:
+            raise ValueError(f'Manifest entry {i + 1} is invalid ({e})') from None
+
+    return specs
+
+
+def apply_spec(config_file: Union[ConfigFile, ConfigDirectory], spec: ServerSpec) -> ServerConfig:
+    config = config_file.find(spec.address, spec.port)
+
+    if config is None:
+        config = ServerConfig(
+            name=spec.name,
+            address=spec.address,
+            port=spec.port,
+            mod=spec.mod_path,
+            slots=spec.slots,
+            reserved_slots=spec.reserved_slots,
+            bots=[],
+            query_port=spec.query_port,
+            autobalance=spec.autobalance,
+            query_directly=spec.query_directly,
+            rotate_bot_names=spec.rotate_bot_names,
+            bot_name_suffixes=spec.bot_name_suffixes
+        )
+        config_file.add(config)
+    else:
+        config.name = spec.name
+        config.mod = spec.mod_path
+        config.slots = spec.slots
+        config.reserved_slots = spec.reserved_slots
+        # Only update optional attributes if given, else we'd remove existing values
+        if spec.query_port is not None:
+            config.query_port = spec.query_port
+        if spec.autobalance is not None:
+            config.autobalance = spec.autobalance
+        if spec.query_directly is not None:
+            config.query_directly = spec.query_directly
+        if spec.rotate_bot_names is not None:
+            config.rotate_bot_names = spec.rotate_bot_names
+        if spec.bot_name_suffixes is not None:
+            config.bot_name_suffixes = spec.bot_name_suffixes
+
+    return config
+
+
+def add_bots(config: ServerConfig, need: int, source: Iterator[str], names: Set[str], stats: Stats) -> None:
+    # Don't take any names we don't need (from the pool)
+    for name in source if len(config.bots) < need else list():
+        if len(name) > 16:
+            stats.count('names.rejected.too_long')
+        elif name in names:
+            stats.count('names.rejected.in_use')
+        else:
+            config.bots.append(BotConfig(
+                basename=name,
+                password=generate_password()
+            ))
+            names.add(name)
+            stats.count('names.accepted')
+
+        if len(config.bots) >= need:
+            break
+        else:
+            print(f'Generating bot names for {config.name} (need {need - len(config.bots)} more)')
 
 
 def is_query_port_required(config: ServerConfig) -> bool:
@@ -30,6 +165,24 @@ def is_query_port_required(config: ServerConfig) -> bool:
     return not ip.is_global or config.query_directly
 
 
+def fetch_account_basenames(targets_path: pathlib.Path) -> Set[str]:
+    from scripts.accounts import connect, strip_name_suffix
+    from scripts.cli import ask_for_passwords, load_targets
+
+    targets = load_targets(targets_path)
+    ask_for_passwords(targets)
+
+    basenames = set()
+    for target in targets:
+        store = connect(target)
+        try:
+            basenames.update(strip_name_suffix(name) for name in store.iter_names(10000))
+        finally:
+            store.close()
+
+    return basenames
+
+
 def dict_filter(d: dict, remove: Any) -> dict:
     return {
         key: value
@@ -38,111 +191,184 @@ def dict_filter(d: dict, remove: Any) -> dict:
     }
 
 
-def generate_bot_names_via_glitch_api() -> Generator[str, None, None]:
-    while True:
-        try:
-            # Can't simply calculate count to fetch here, since certain count values lead to API errors
-            resp = requests.get(
-                'https://story-shack-cdn-v2.glitch.me/generators/gamertag-generator',
-                params={'count': 6}
-            )
-
-            if resp.ok:
-                parsed = resp.json()
-                for tag in parsed['data']:
-                    yield tag['name']
-            else:
-                raise Exception(f'Failed to fetch bot names, server responded with HTTP/{resp.status_code}')
-        except requests.RequestException as e:
-            raise Exception(f'Failed to fetch bot names: {e}') from None
-
-
 parser = argparse.ArgumentParser(description='Generate server configuration (including bots) '
                                              'and add it to a given config file')
-parser.add_argument('--config', help='Path to bot server configs (config.yaml)', type=str, required=True)
-parser.add_argument('--name', help='Name of the server', type=str, required=True)
-parser.add_argument('--address', help='IP address of the server', type=str, required=True)
-parser.add_argument('--port', help='Game port of the server', type=int, required=True)
+parser.add_argument('--config', help='Path to bot server configs (config.yaml or config directory)', type=str,
+                    required=True)
+parser.add_argument('--manifest', help='Path to manifest (csv/yaml) listing any number of servers to add/update '
+                                       '(replaces all server-specific arguments)', type=str)
+parser.add_argument('--name', help='Name of the server', type=str)
+parser.add_argument('--address', help='IP address of the server', type=str)
+parser.add_argument('--port', help='Game port of the server', type=int)
 parser.add_argument('--query-port', help='Query port of the server', type=int)
 parser.add_argument('--mod', help='Mod the server is running by default (without "mods/" prefix)',
                     type=str, default='bf2')
-parser.add_argument('--slots', help='Number of slots to fill with bots', type=int, required=True)
-parser.add_argument('--reserved-slots', help='Number of slots to keep free for real players', type=int, required=True)
+parser.add_argument('--slots', help='Number of slots to fill with bots', type=int)
+parser.add_argument('--reserved-slots', help='Number of slots to keep free for real players', type=int)
 parser.add_argument('--overpopulate-factor', help='Maximum factor to determine how many bots may be launched '
                                                   'beyond the desired slot count', type=int, default=2)
 parser.add_argument('--name-source', help='Source for names of bots', type=BotNameSource,
                     default=BotNameSource.GlitchAPI)
+parser.add_argument('--name-api-url', help='URL of gamertag generator API to fetch bot names from',
+                    type=str, default=GLITCH_API_URL)
+parser.add_argument('--name-api-concurrency', help='Number of requests to the gamertag generator API to keep in flight',
+                    type=int, default=4)
+parser.add_argument('--name-pool', help='Path to local pool of previously fetched, unused bot names',
+                    type=str, default=NamePool.get_default_path())
+parser.add_argument('--name-pool-size', help='Maximum number of names to keep in local name pool',
+                    type=int, default=10000)
+parser.add_argument('--prefetch-names', help='Number of names to fetch into local name pool '
+                                             'in addition to the ones needed', type=int, default=100)
+parser.add_argument('--no-name-pool', help='Always fetch bot names from gamertag generator API '
+                                           'instead of local name pool', dest='use_name_pool', action='store_false')
+parser.add_argument('--name-seed', help='Seed for picking/generating bot names (only used with "ai-names" and '
+                                        '"generated" name sources, defaults to a random seed)', type=int)
+parser.add_argument('--exclude-accounts', help='Path to database targets file (yaml) listing account databases whose '
+                                               'names must not be generated (only used with "generated" name source)',
+                    type=str)
 parser.add_argument('--no-autobalance', help='Disable autobalancing bots between teams',
                     dest='autobalance', action='store_false')
 parser.add_argument('--query-directly', help='Query the server directly instead of using the bflist API',
                     dest='query_directly', action='store_true')
-parser.set_defaults(autobalance=None, query_directly=None)
+parser.add_argument('--no-rotate-bot-names', help='Disable adding rotating suffix to bot names',
+                    dest='rotate_bot_names', action='store_false')
+parser.add_argument('--bot-name-suffixes', help='Number of suffixes to rotate bot names through (1-16)', type=int)
+parser.add_argument('--discover-query-ports', help='Probe servers without a query port for it via GameSpy queries',
+                    dest='discover_query_ports', action='store_true')
+parser.add_argument('--query-port-range', help='Range of ports to probe for query ports (e.g. "29900-29999")',
+                    type=parse_port_range, default=list(DEFAULT_QUERY_PORTS))
+parser.add_argument('--query-timeout', help='Seconds to wait for a response to each query port probe',
+                    type=float, default=0.5)
+parser.add_argument('--query-concurrency', help='Number of query port probes to keep in flight',
+                    type=int, default=512)
+parser.add_argument('--no-cache', help='Always parse config file instead of using cached, previously parsed config',
+                    dest='cache', action='store_false')
+parser.add_argument('--stats', help='Print phase durations, name request latencies and rejected names by reason '
+                                    'as JSON once done', action='store_true')
+parser.set_defaults(autobalance=None, query_directly=None, rotate_bot_names=None)
 args = parser.parse_args()
 
-configPath = pathlib.Path(args.config).absolute()
-configs: List[ServerConfig] = []
-if not os.path.isfile(configPath):
-    print(f'Could not find config file at given path ({configPath}), creating new config')
+if args.manifest is not None:
+    manifestPath = pathlib.Path(args.manifest).absolute()
+    if not os.path.isfile(manifestPath):
+        print(f'Could not find manifest file at given path ({manifestPath})')
+        sys.exit(1)
+    try:
+        specs = load_manifest(manifestPath, args.overpopulate_factor)
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
 else:
-    with open(configPath, 'r') as configFile:
-        configs.extend([ServerConfig.load(parsed) for parsed in yaml.load(configFile, yaml.Loader)])
-
-config = next(
-    (config for config in configs if config.address == args.address and config.port == args.port),
-    None
-)
-
-if config is None:
-    config = ServerConfig(
+    for required in ['name', 'address', 'port', 'slots', 'reserved_slots']:
+        if getattr(args, required) is None:
+            parser.error(f'the following arguments are required: --{required.replace("_", "-")} (or --manifest)')
+    specs = [ServerSpec(
         name=args.name,
-        address=args.adddress,
+        address=args.address,
         port=args.port,
-        mod=f'mods/{args.mod}',
         slots=args.slots,
         reserved_slots=args.reserved_slots,
-        bots=[],
+        mod=args.mod,
+        overpopulate_factor=args.overpopulate_factor,
         query_port=args.query_port,
         autobalance=args.autobalance,
-        query_directly=args.query_directly
-    )
-    configs.append(config)
+        query_directly=args.query_directly,
+        rotate_bot_names=args.rotate_bot_names,
+        bot_name_suffixes=args.bot_name_suffixes
+    )]
+
+stats = Stats()
+configPath = pathlib.Path(args.config).absolute()
+if not os.path.exists(configPath):
+    print(f'Could not find config file at given path ({configPath}), creating new config')
+    configFile = ConfigFile(configPath, [])
 else:
-    config.name = args.name
-    config.mod = f'mods/{args.mod}'
-    config.slots = args.slots
-    config.reserved_slots = args.reserved_slots
-    # Only update optional attributes if given, else we'd remove existing values
-    if args.query_port is not None:
-        config.query_port = args.query_port
-    if args.autobalance is not None:
-        config.autobalance = args.autobalance
-    if args.query_directly is not None:
-        config.query_directly = args.query_directly
-
-if is_query_port_required(config) and config.query_port is None:
-    print(f'Query port is required but missing, please provide it using --query-port')
+    with stats.span('load_config'):
+        configFile = open_config(configPath, use_cache=args.cache)
+
+servers = [(apply_spec(configFile, spec), spec) for spec in specs]
+configs = configFile.configs
+
+if args.discover_query_ports:
+    undiscovered = [config for config, _ in servers if config.query_port is None]
+    if len(undiscovered) > 0:
+        print(f'Probing {len(args.query_port_range)} ports for query ports of {len(undiscovered)} server(s)')
+        with stats.span('discover_query_ports'):
+            discovered = discover_query_ports([(config.address, config.port) for config in undiscovered],
+                                              args.query_port_range, args.query_timeout, args.query_concurrency)
+        for config in undiscovered:
+            config.query_port = discovered.get((config.address, config.port))
+            if config.query_port is not None:
+                print(f'Discovered query port {config.query_port} for {config.name}')
+
+missingQueryPorts = [
+    config.name for config, _ in servers
+    if is_query_port_required(config) and config.query_port is None
+]
+if len(missingQueryPorts) > 0:
+    print(f'Query port is required but missing for {", ".join(missingQueryPorts)}, '
+          f'please provide it using --query-port/in the manifest or use --discover-query-ports')
     sys.exit(1)
 
+names = {bot.basename for server in configs for bot in server.bots}
+# Request names for all servers at once, rather than server by server
+need = sum(max(spec.slots * spec.overpopulate_factor - len(config.bots), 0) for config, spec in servers)
+
+pool: Optional[NamePool] = None
+if args.name_source in [BotNameSource.AINames, BotNameSource.Generated] and args.name_seed is None:
+    # A fixed default seed would hand out the same names to every new config, clashing in shared account databases
+    args.name_seed = secrets.randbits(32)
+    print(f'Picking bot names using seed {args.name_seed} (use --name-seed to repeat)')
+
 if args.name_source is BotNameSource.AINames:
-    from scripts.ai_names import AI_NAMES
-    source = AI_NAMES
+    from scripts.ai_names import sample_ai_names
+    source = sample_ai_names(names, args.name_seed)
+elif args.name_source is BotNameSource.Generated:
+    from scripts.name_generator import NameIndex, generate_bot_names
+    existing = set(names)
+    if args.exclude_accounts is not None:
+        existing.update(fetch_account_basenames(pathlib.Path(args.exclude_accounts).absolute()))
+    source = generate_bot_names(NameIndex(existing, max(need, 1024)), args.name_seed, stats=stats)
 else:
-    source = generate_bot_names_via_glitch_api()
+    source = generate_bot_names_via_glitch_api(args.name_api_url, args.name_api_concurrency, stats)
+    if args.use_name_pool:
+        pool = NamePool.load(pathlib.Path(args.name_pool), args.name_pool_size)
+        # Names used in any config must never be handed out again
+        pool.discard(names)
+        if need > 0 and len(pool) < need + args.prefetch_names:
+            print(f'Fetching bot names into local name pool (have {len(pool)}, want {need + args.prefetch_names})')
+            try:
+                with stats.span('fill_name_pool'):
+                    pool.fill(source, need + args.prefetch_names, names, stats)
+            except Exception as e:
+                # Keep whatever we managed to fetch and only give up if the pool cannot cover what we need
+                pool.save()
+                if len(pool) < need:
+                    raise
+                print(f'Failed to prefetch bot names, continuing with names from local name pool ({e})')
+        # Fall back to fetching names directly in the unlikely case that the pool cannot provide enough names
+        source = itertools.chain(pool.drain(), source)
 
-names = {bot.basename for server in configs for bot in server.bots}
-need = config.slots * args.overpopulate_factor
-for name in source:
-    if len(config.bots) < need and len(name) <= 16 and name not in names:
-        config.bots.append(BotConfig(
-            basename=name,
-            password=generate_password()
-        ))
-        names.add(name)
-
-    if len(config.bots) >= need:
-        break
-    else:
-        print(f'Generating bot names (need {need - len(config.bots)} more)')
+# Use a single iterator for all servers, so no server starts over at the beginning of the source
+source = iter(source)
+with stats.span('add_bots'):
+    for config, spec in servers:
+        add_bots(config, spec.slots * spec.overpopulate_factor, source, names, stats)
+
+# Bots have only been added to the given servers now, so this is the first point at which the config has to be valid.
+# Overpopulate factors may differ between servers, so the number of bots cannot be validated here.
+with stats.span('validate'):
+    errors = validate_config_file(configFile)
+if len(errors) > 0:
+    print(f'Config would be invalid, not saving it ({len(errors)} error(s)):')
+    print('\n'.join(errors))
+    sys.exit(1)
+
+with stats.span('save'):
+    configFile.save(use_cache=args.cache)
+
+if pool is not None:
+    pool.save()
 
-with open(configPath, 'w') as configFile:
-    yaml.dump([config.dump() for config in configs], configFile, sort_keys=False)
+if args.stats:
+    print_stats(stats.dump())
@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+import pathlib
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from scripts.config import get_cache_dir
+
+
+class ProvisioningJournal:
+    path: pathlib.Path
+    target: str
+
+    # Digest of the account names the run was started for, resuming is only safe if they did not change
+    digest: Optional[str]
+    first_pid: Optional[int]
+    # Names of accounts missing when the run started, in the order pids were assigned to them
+    planned: List[str]
+    # Pids assigned to accounts in place of their planned ones, since someone else took the planned pid
+    reassigned: Dict[str, int]
+    completed: Set[str]
+
+    def __init__(self, path: pathlib.Path, target: str):
+        self.path = path
+        self.target = target
+        self.digest = None
+        self.first_pid = None
+        self.planned = list()
+        self.reassigned = dict()
+        self.completed = set()
+
+    @staticmethod
+    def get_default_path(target: str) -> pathlib.Path:
+        digest = hashlib.sha1(target.encode()).hexdigest()
+        return get_cache_dir().joinpath('journals', f'accounts-{digest}.jsonl')
+
+    @staticmethod
+    def load(path: pathlib.Path, target: str) -> 'ProvisioningJournal':
+        journal = ProvisioningJournal(path, target)
+        try:
+            with open(path, 'r') as journalFile:
+                lines = journalFile.readlines()
+        except OSError:
+            return journal
+
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # Last line may have been cut off when the run was killed, the batch it records is simply redone
+                break
+
+            if 'planned' in entry:
+                journal.digest = entry['digest']
+                journal.first_pid = entry['first_pid']
+                journal.planned = entry['planned']
+            elif 'reassigned' in entry:
+                journal.reassigned.update((name, entry['first_pid'] + i) for i, name in enumerate(entry['reassigned']))
+            else:
+                journal.completed.update(entry['completed'])
+
+        return journal
+
+    @staticmethod
+    def get_digest(names: Iterable[str]) -> str:
+        digest = hashlib.sha1()
+        for name in names:
+            digest.update(name.encode())
+            digest.update(b'\n')
+        return digest.hexdigest()
+
+    def exists(self) -> bool:
+        return self.first_pid is not None
+
+    def start(self, digest: str, first_pid: int, planned: List[str]) -> None:
+        self.digest = digest
+        self.first_pid = first_pid
+        self.planned = planned
+        self.reassigned = dict()
+        self.completed = set()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w') as journalFile:
+            self.write(journalFile, {
+                'target': self.target,
+                'digest': digest,
+                'first_pid': first_pid,
+                'planned': planned
+            })
+
+    def pending(self) -> List[Tuple[int, str]]:
+        # Each account keeps the pid it was last assigned, so resuming never reuses pids
+        return [
+            (self.reassigned.get(name, self.first_pid + i), name)
+            for i, name in enumerate(self.planned)
+            if name not in self.completed
+        ]
+
+    def reassign(self, first_pid: int, names: List[str]) -> None:
+        self.reassigned.update((name, first_pid + i) for i, name in enumerate(names))
+        with open(self.path, 'a') as journalFile:
+            self.write(journalFile, {'first_pid': first_pid, 'reassigned': names})
+
+    def complete(self, names: List[str]) -> None:
+        self.completed.update(names)
+        with open(self.path, 'a') as journalFile:
+            self.write(journalFile, {'completed': names})
+
+    def remove(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        self.digest = None
+        self.first_pid = None
+        self.planned = list()
+        self.reassigned = dict()
+        self.completed = set()
+
+    @staticmethod
+    def write(file, entry: dict) -> None:
+        file.write(json.dumps(entry) + '\n')
+        # A batch must never be recorded as completed unless the entry actually made it to disk
+        file.flush()
+        os.fsync(file.fileno())
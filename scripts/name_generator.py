@@ -0,0 +1,113 @@
+import hashlib
+import math
+import random
+from typing import Generator, Iterable, Optional, Set
+
+from scripts.stats import Stats
+
+ADJECTIVES = (
+    'Able', 'Agile', 'Amber', 'Ample', 'Arctic', 'Ashen', 'Azure', 'Bitter', 'Bold', 'Brave', 'Brisk', 'Bronze',
+    'Calm', 'Candid', 'Clever', 'Cobalt', 'Cosmic', 'Crimson', 'Crisp', 'Dapper', 'Daring', 'Dusty', 'Eager',
+    'Early', 'Elder', 'Ember', 'Epic', 'Fabled', 'Fierce', 'Fluffy', 'Frosty', 'Gentle', 'Giddy', 'Gilded',
+    'Gloomy', 'Golden', 'Grand', 'Grim', 'Hasty', 'Hazy', 'Hidden', 'Hollow', 'Humble', 'Icy', 'Idle', 'Iffy',
+    'Iron', 'Jolly', 'Keen', 'Lanky', 'Lazy', 'Lone', 'Lucky', 'Lunar', 'Mellow', 'Merry', 'Mighty', 'Misty',
+    'Modest', 'Molten', 'Murky', 'Nimble', 'Noble', 'Odd', 'Olive', 'Pale', 'Plucky', 'Polar', 'Proud', 'Quick',
+    'Quiet', 'Rapid', 'Rusty', 'Sandy', 'Scarlet', 'Shady', 'Silent', 'Silver', 'Sleepy', 'Sly', 'Snowy',
+    'Solar', 'Steady', 'Stormy', 'Sturdy', 'Sunny', 'Swift', 'Tame', 'Tidy', 'Tiny', 'Tough', 'Upbeat',
+    'Vivid', 'Wary', 'Wild', 'Windy', 'Wise', 'Witty', 'Young', 'Zany', 'Zesty'
+)
+
+NOUNS = (
+    'Acorn', 'Anchor', 'Arrow', 'Badger', 'Bandit', 'Beacon', 'Bison', 'Blade', 'Boulder', 'Bravo', 'Buffalo',
+    'Cactus', 'Canyon', 'Cedar', 'Comet', 'Condor', 'Cougar', 'Coyote', 'Crane', 'Cricket', 'Dagger', 'Delta',
+    'Dingo', 'Drifter', 'Eagle', 'Echo', 'Falcon', 'Ferret', 'Fox', 'Gecko', 'Ghost', 'Glacier', 'Goose',
+    'Granite', 'Hawk', 'Heron', 'Hornet', 'Hunter', 'Jackal', 'Jaguar', 'Kestrel', 'Koala', 'Lancer', 'Lean',
+    'Lemur', 'Lynx', 'Mamba', 'Mantis', 'Marmot', 'Meteor', 'Moose', 'Nomad', 'Ocelot', 'Onyx', 'Orbit',
+    'Osprey', 'Otter', 'Panda', 'Panther', 'Parrot', 'Pebble', 'Pilot', 'Puma', 'Quail', 'Ranger', 'Raven',
+    'Ridge', 'Rocket', 'Rover', 'Sable', 'Saber', 'Scout', 'Shadow', 'Shark', 'Sparrow', 'Spike', 'Storm',
+    'Summit', 'Tango', 'Thistle', 'Thunder', 'Tiger', 'Toy', 'Trout', 'Tundra', 'Viper', 'Voyager', 'Walrus',
+    'Willow', 'Wolf', 'Wombat', 'Xray', 'Yak', 'Zebra', 'Zephyr'
+)
+
+ONSETS = (
+    'B', 'Br', 'C', 'Ch', 'D', 'Dr', 'F', 'G', 'Gr', 'H', 'J', 'K', 'Kr', 'L', 'M', 'N', 'P', 'R', 'S', 'Sh',
+    'St', 'T', 'Th', 'Tr', 'V', 'W', 'Z'
+)
+VOWELS = ('a', 'e', 'i', 'o', 'u', 'ai', 'ea', 'ou', 'y')
+CODAS = ('', '', 'k', 'l', 'n', 'r', 's', 'x', 'nd', 'rk', 'st', 'th')
+
+
+class BloomFilter:
+    size: int
+    hashes: int
+    bits: bytearray
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        # Standard sizing for the given number of items and false positive rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def positions(self, item: str) -> Generator[int, None, None]:
+        # Derive all positions from a single digest (Kirsch-Mitzenmacher double hashing)
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str) -> None:
+        for position in self.positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self.positions(item))
+
+
+class NameIndex:
+    existing: Set[str]
+    generated: BloomFilter
+
+    def __init__(self, existing: Iterable[str], capacity: int):
+        # Existing names are few and need exact answers, generated names only need to never be handed out twice.
+        # A false positive on the latter merely skips a usable candidate, so a compact bloom filter suffices.
+        self.existing = set(existing)
+        self.generated = BloomFilter(capacity)
+
+    def add(self, name: str) -> None:
+        self.generated.add(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.existing or name in self.generated
+
+
+def generate_word(rng: random.Random) -> str:
+    # Only close the final syllable to avoid hard to pronounce consonant clusters
+    syllables = [rng.choice(ONSETS) + rng.choice(VOWELS) for _ in range(rng.randint(1, 3))]
+    return (''.join(syllables) + rng.choice(CODAS)).capitalize()
+
+
+def generate_name(rng: random.Random) -> str:
+    pattern = rng.randrange(4)
+    if pattern == 0:
+        return rng.choice(ADJECTIVES) + rng.choice(NOUNS)
+    elif pattern == 1:
+        return rng.choice(ADJECTIVES) + generate_word(rng)
+    elif pattern == 2:
+        return generate_word(rng) + rng.choice(NOUNS)
+    return generate_word(rng) + generate_word(rng)
+
+
+def generate_bot_names(index: NameIndex, seed: Optional[int] = 0, max_length: int = 16,
+                       stats: Optional[Stats] = None) -> Generator[str, None, None]:
+    stats = stats if stats is not None else Stats()
+    rng = random.Random(seed)
+    while True:
+        name = generate_name(rng)
+        if len(name) > max_length:
+            stats.count('names.rejected.too_long')
+        elif name in index:
+            stats.count('names.rejected.in_use')
+        else:
+            index.add(name)
+            yield name
@@ -0,0 +1,195 @@
+import json
+import os
+import pathlib
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from enum import Enum
+from typing import Dict, Generator, Iterable, Iterator, List, Optional, Set
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from scripts.config import get_cache_dir
+from scripts.stats import Stats
+from scripts.validation import MAX_BASENAME_LENGTH
+
+GLITCH_API_URL = 'https://story-shack-cdn-v2.glitch.me/generators/gamertag-generator'
+
+
+class BotNameSource(str, Enum):
+    GlitchAPI = "glitch.me"
+    AINames = "ai-names"
+    Generated = "generated"
+
+
+class GlitchNameFetcher:
+    url: str
+    concurrency: int
+    retries: int
+    backoff: float
+    timeout: float
+
+    session: requests.Session
+    seen: Set[str]
+    stats: Stats
+
+    def __init__(
+            self,
+            url: str = GLITCH_API_URL,
+            concurrency: int = 4,
+            retries: int = 3,
+            backoff: float = 0.5,
+            timeout: float = 10,
+            session: Optional[requests.Session] = None,
+            stats: Optional[Stats] = None
+    ):
+        self.url = url
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+
+        if session is None:
+            # Keep connections alive between requests instead of doing a new (TLS) handshake for every request
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        self.session = session
+        self.seen = set()
+        self.stats = stats if stats is not None else Stats()
+
+    def fetch(self) -> List[str]:
+        attempt = 0
+        while True:
+            try:
+                # Can't simply calculate count to fetch here, since certain count values lead to API errors
+                with self.stats.timed('name_request'):
+                    resp = self.session.get(self.url, params={'count': 6}, timeout=self.timeout)
+
+                if resp.ok:
+                    parsed = resp.json()
+                    return [tag['name'] for tag in parsed['data']]
+
+                self.stats.count(f'name_requests.failed.http_{resp.status_code}')
+                if resp.status_code != 429 and resp.status_code < 500 or attempt >= self.retries:
+                    raise Exception(f'Failed to fetch bot names, server responded with HTTP/{resp.status_code}')
+            except requests.RequestException as e:
+                self.stats.count(f'name_requests.failed.{type(e).__name__}')
+                if attempt >= self.retries:
+                    raise Exception(f'Failed to fetch bot names: {e}') from None
+
+            time.sleep(self.backoff * 2 ** attempt)
+            attempt += 1
+
+    def names(self) -> Generator[str, None, None]:
+        executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        try:
+            # Keep several requests in flight, replacing each one as soon as it completes
+            pending: Set[Future] = {executor.submit(self.fetch) for _ in range(self.concurrency)}
+            while True:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for name in future.result():
+                        # Different requests may well return the same name, so only yield each name once
+                        if name not in self.seen:
+                            self.seen.add(name)
+                            yield name
+                        else:
+                            self.stats.count('names.rejected.duplicate')
+                    pending.add(executor.submit(self.fetch))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def generate_bot_names_via_glitch_api(url: str = GLITCH_API_URL, concurrency: int = 4,
+                                      stats: Optional[Stats] = None) -> Generator[str, None, None]:
+    return GlitchNameFetcher(url, concurrency, stats=stats).names()
+
+
+class NamePool:
+    path: pathlib.Path
+    max_size: int
+    max_age: float
+
+    # Maps names to the time they were added, ordered from oldest to newest
+    entries: Dict[str, float]
+
+    def __init__(self, path: pathlib.Path, max_size: int = 10000, max_age: float = 90 * 24 * 60 * 60):
+        self.path = path
+        self.max_size = max_size
+        self.max_age = max_age
+        self.entries = dict()
+
+    @staticmethod
+    def get_default_path() -> pathlib.Path:
+        return get_cache_dir().joinpath('names.json')
+
+    @staticmethod
+    def load(path: pathlib.Path, max_size: int = 10000, max_age: float = 90 * 24 * 60 * 60) -> 'NamePool':
+        pool = NamePool(path, max_size, max_age)
+        try:
+            with open(path, 'r') as poolFile:
+                entries = json.load(poolFile)
+            pool.entries = dict(sorted(entries.items(), key=lambda entry: entry[1]))
+        except (OSError, ValueError, AttributeError):
+            # Start over with an empty pool if there is none yet or it cannot be read
+            pass
+
+        pool.evict()
+        return pool
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, name: str) -> bool:
+        if len(name) > MAX_BASENAME_LENGTH or name in self.entries:
+            return False
+
+        self.entries[name] = time.time()
+        return True
+
+    def discard(self, names: Iterable[str]) -> None:
+        for name in names:
+            self.entries.pop(name, None)
+
+    def evict(self) -> None:
+        cutoff = time.time() - self.max_age
+        expired = [name for name, added in self.entries.items() if added < cutoff]
+        self.discard(expired)
+
+        # Entries are ordered by age, so the oldest ones are dropped first
+        overflow = len(self.entries) - self.max_size
+        if overflow > 0:
+            self.discard(list(self.entries)[:overflow])
+
+    def fill(self, source: Iterator[str], size: int, exclude: Set[str], stats: Optional[Stats] = None) -> int:
+        stats = stats if stats is not None else Stats()
+        added = 0
+        while len(self.entries) < size:
+            name = next(source, None)
+            if name is None:
+                break
+            if name in exclude:
+                stats.count('names.rejected.in_use')
+            elif self.add(name):
+                added += 1
+            else:
+                stats.count('names.rejected.too_long' if len(name) > MAX_BASENAME_LENGTH else 'names.rejected.pooled')
+
+        return added
+
+    def drain(self) -> Generator[str, None, None]:
+        # Serve the oldest names first, they are the next ones to be evicted anyway
+        for name in list(self.entries):
+            # Names may have been discarded since we started
+            if self.entries.pop(name, None) is not None:
+                yield name
+
+    def save(self) -> None:
+        self.evict()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(temp_path, 'w') as poolFile:
+            json.dump(self.entries, poolFile)
+        os.replace(temp_path, self.path)
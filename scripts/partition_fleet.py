@@ -0,0 +1,148 @@
+import argparse
+import os
+import pathlib
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from scripts.config import ConfigFile, open_config
+from scripts.types import ServerConfig
+
+
+@dataclass
+class Host:
+    name: str
+    weight: float = 1
+    servers: List[ServerConfig] = field(default_factory=list)
+    load: int = 0
+
+    def assign(self, config: ServerConfig, load: int) -> None:
+        self.servers.append(config)
+        self.load += load
+
+
+def parse_host(value: str) -> Host:
+    name, _, weight = value.partition(':')
+    return Host(name, float(weight) if weight else 1)
+
+
+def get_server_key(config: ServerConfig) -> str:
+    return f'{config.address}:{config.port}'
+
+
+def get_peak_bots(config: ServerConfig, overpopulate_factor: int) -> int:
+    # The manager never runs more bot processes than there are bots configured
+    return min(config.slots * overpopulate_factor, len(config.bots))
+
+
+def partition(configs: List[ServerConfig], hosts: List[Host], previous: Dict[str, str], overpopulate_factor: int,
+              tolerance: float) -> None:
+    loads = {id(config): get_peak_bots(config, overpopulate_factor) for config in configs}
+    total = sum(loads.values())
+    weights = sum(host.weight for host in hosts)
+    limits = {host.name: total * host.weight / weights * (1 + tolerance) for host in hosts}
+    by_name = {host.name: host for host in hosts}
+
+    # Keep servers on their previous host as long as that host stays within its share (plus tolerance),
+    # placing the largest servers first so small ones are the ones to move if a host is over its share
+    remaining = []
+    for config in sorted(configs, key=lambda c: loads[id(c)], reverse=True):
+        host = by_name.get(previous.get(get_server_key(config)))
+        load = loads[id(config)]
+        if host is not None and (host.load + load <= limits[host.name] or len(host.servers) == 0):
+            host.assign(config, load)
+        else:
+            remaining.append(config)
+
+    # Place all other servers largest first on the host with the least load relative to its weight (LPT)
+    for config in remaining:
+        load = loads[id(config)]
+        host = min(hosts, key=lambda h: (h.load + load) / h.weight)
+        host.assign(config, load)
+
+    # Keep servers in config order within each host
+    order = {id(config): i for (i, config) in enumerate(configs)}
+    for host in hosts:
+        host.servers.sort(key=lambda c: order[id(c)])
+
+
+def load_previous_assignments(output_dir: pathlib.Path, hosts: List[Host], use_cache: bool) -> Dict[str, str]:
+    # Read configs of hosts which are still listed last, so they win if a server somehow ended up on multiple hosts
+    listed = {host.name for host in hosts}
+    paths = sorted(output_dir.glob('*.yaml'), key=lambda p: (p.stem in listed, p.stem))
+
+    previous = dict()
+    for path in paths:
+        for config in ConfigFile.load(path, use_cache).configs:
+            previous[get_server_key(config)] = path.stem
+    return previous
+
+
+parser = argparse.ArgumentParser(description='Split servers from config across multiple bot manager hosts, '
+                                             'writing one config per host')
+parser.add_argument('--config', help='Path to bot server configs (config.yaml or config directory)', type=str,
+                    required=True)
+parser.add_argument('--output-dir', help='Directory to write per host configs to (previously written configs are '
+                                         'used to keep servers on the same host)', type=str, required=True)
+parser.add_argument('--host', help='Name of host to run bots on, optionally with capacity weight (name[:weight], '
+                                   'repeatable)', type=parse_host, action='append', dest='hosts', default=list())
+parser.add_argument('--hosts', help='Number of equally weighted hosts to run bots on (named host-1 to host-N)',
+                    type=int, dest='host_count')
+parser.add_argument('--overpopulate-factor', help='Factor the manager uses to determine how many bots may be launched '
+                                                  'beyond the desired slot count', type=int, default=2)
+parser.add_argument('--tolerance', help='Share a host may exceed its capacity by before servers are moved off it',
+                    type=float, default=0.1)
+parser.add_argument('--no-cache', help='Always parse config file instead of using cached, previously parsed config',
+                    dest='cache', action='store_false')
+args = parser.parse_args()
+
+hosts: List[Host] = args.hosts
+if args.host_count is not None:
+    hosts.extend(Host(f'host-{i}') for i in range(1, args.host_count + 1))
+if len(hosts) == 0:
+    parser.error('either --host or --hosts is required')
+if len({host.name for host in hosts}) != len(hosts):
+    parser.error('host names must be unique')
+if any(host.weight <= 0 for host in hosts):
+    parser.error('host weights must be positive')
+
+configPath = pathlib.Path(args.config).absolute()
+if not os.path.exists(configPath):
+    print(f'Could not find config file at given path ({configPath})')
+    sys.exit(1)
+
+source = open_config(configPath, use_cache=args.cache)
+configs = source.configs
+
+outputDir = pathlib.Path(args.output_dir).absolute()
+previous = load_previous_assignments(outputDir, hosts, args.cache)
+
+partition(configs, hosts, previous, args.overpopulate_factor, args.tolerance)
+
+outputDir.mkdir(parents=True, exist_ok=True)
+total = sum(host.load for host in hosts)
+migrations = 0
+idle = []
+for host in hosts:
+    if len(host.servers) == 0:
+        # A config without any servers would not be valid, and any previous one would run servers now placed elsewhere
+        idle.append(host.name)
+        outputDir.joinpath(f'{host.name}.yaml').unlink(missing_ok=True)
+        continue
+
+    # Copy server entries as they are in the source config
+    hostFile = ConfigFile(outputDir.joinpath(f'{host.name}.yaml'), host.servers,
+                          segments=[source.get_segment(config) for config in host.servers])
+    hostFile.save(use_cache=args.cache)
+
+    moved = [config for config in host.servers if previous.get(get_server_key(config), host.name) != host.name]
+    migrations += len(moved)
+    print(f'{host.name}: {len(host.servers)} servers, {host.load} bots at peak '
+          f'({host.load / max(total, 1) * 100:.1f}% of fleet, weight {host.weight:g}), {len(moved)} moved here')
+
+if len(idle) > 0:
+    print(f'Hosts without any servers were not given a config (previous ones were removed): {", ".join(idle)}')
+stale = {path.stem for path in outputDir.glob('*.yaml')} - {host.name for host in hosts}
+if len(stale) > 0:
+    print(f'Configs of hosts no longer listed were left as they are: {", ".join(sorted(stale))}')
+print(f'Partitioned {len(configs)} servers across {len(hosts)} hosts, moving {migrations} servers')
@@ -0,0 +1,109 @@
+import argparse
+import os
+import pathlib
+import sys
+import time
+from typing import Set
+
+from scripts.accounts import DatabaseTarget, build_accounts, connect
+from scripts.cli import add_target_parsers, get_targets
+from scripts.config import open_config
+from scripts.stats import Stats, print_stats
+from scripts.validation import validate_config_file
+
+
+def prune_target(target: DatabaseTarget, used: Set[str], batch_size: int, dry_run: bool, stats: Stats) -> bool:
+    store = None
+    try:
+        store = connect(target)
+        store.stats = stats
+
+        with stats.span('lookup'):
+            # Only ever consider accounts recorded as added by provisioning runs, any others belong to players
+            owned = store.fetch_owned_accounts(batch_size)
+        if owned is None:
+            print(f'{target}: found no accounts recorded as added by create_accounts, nothing to delete')
+            return True
+
+        orphaned = [(pid, name) for pid, name in owned if name not in used]
+        stats.count('rows.orphaned', len(orphaned))
+
+        if dry_run:
+            for pid, name in orphaned:
+                print(f'{target}: would delete {name} ({pid})')
+            print(f'{target}: would delete {len(orphaned)} orphaned accounts')
+            return True
+
+        start = time.perf_counter()
+        progress = 0
+
+        def report(attempted: int, deleted: int) -> None:
+            nonlocal progress
+            progress += attempted
+            print(f'{target}: deleted {deleted} of {attempted} accounts in chunk ({progress}/{len(orphaned)})')
+
+        with stats.span('delete'):
+            deleted = store.delete_ids([pid for pid, _ in orphaned], batch_size, report)
+        stats.count('rows.deleted', deleted)
+        elapsed = time.perf_counter() - start
+        print(f'{target}: deleted {deleted} orphaned accounts in {elapsed:.2f}s '
+              f'({deleted / max(elapsed, 1e-6):.0f} rows/s)')
+        return True
+    except Exception as e:
+        # Chunks deleted so far remain deleted, running again picks up the remaining ones
+        stats.count(f'errors.{type(e).__name__}')
+        print(f'{target}: failed to delete orphaned accounts ({e})')
+        return False
+    finally:
+        if store is not None:
+            store.close()
+
+
+parser = argparse.ArgumentParser(description='Delete bot accounts from MySQL/SQLite table '
+                                             'which are no longer used by any bot in config')
+parser.add_argument('--config', help='Path to bot server configs (config.yaml or config directory)', type=str,
+                    required=True)
+parser.add_argument('--no-cache', help='Always parse config file instead of using cached, previously parsed config',
+                    dest='cache', action='store_false')
+parser.add_argument('--batch-size', help='Number of accounts to delete per transaction', type=int, default=500)
+parser.add_argument('--dry-run', help='Only list accounts which would be deleted', action='store_true')
+parser.add_argument('--stats', help='Print phase durations, row counts and statement latencies as JSON once done',
+                    action='store_true')
+subparsers = parser.add_subparsers(title='Database backend type', dest='backend', required=True)
+add_target_parsers(subparsers, 'delete accounts from')
+args = parser.parse_args()
+
+configPath = pathlib.Path(args.config).absolute()
+if not os.path.exists(configPath):
+    print(f'Could not find config file at given path ({configPath})')
+    sys.exit(1)
+
+stats = Stats()
+with stats.span('load_config'):
+    configFile = open_config(configPath, use_cache=args.cache)
+    configs = configFile.configs
+
+# Accounts of any bot missing from the config would be deleted, so only ever prune based on a valid config
+with stats.span('validate'):
+    errors = validate_config_file(configFile)
+if len(errors) > 0:
+    print(f'Config file is invalid ({len(errors)} error(s)):')
+    print('\n'.join(errors))
+    sys.exit(1)
+if len(configs) == 0:
+    print('Config file does not contain any servers, refusing to delete all accounts')
+    sys.exit(1)
+
+with stats.span('build_accounts'):
+    # Accounts are only in use if a configured bot logs in with that name (basename and suffix)
+    used = {name for name, _ in build_accounts(configs)}
+
+targets = get_targets(args)
+
+results = [prune_target(target, used, args.batch_size, args.dry_run, stats) for target in targets]
+
+if args.stats:
+    print_stats(stats.dump())
+
+if not all(results):
+    sys.exit(1)
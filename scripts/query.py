@@ -0,0 +1,113 @@
+import asyncio
+import itertools
+import struct
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# BF2 servers answer GameSpy v3 queries on 29900 by default, additional servers on a host usually count up from there
+DEFAULT_QUERY_PORTS = range(29900, 30000)
+
+GAMESPY3_MAGIC = b'\xfe\xfd'
+GAMESPY3_QUERY = 0x00
+# Request all server info keys, but no player and team info (which we don't need and could require split packets)
+GAMESPY3_SERVER_INFO = b'\xff\x00\x00'
+
+
+def build_query_packet(session_id: int) -> bytes:
+    return GAMESPY3_MAGIC + struct.pack('>BI', GAMESPY3_QUERY, session_id) + GAMESPY3_SERVER_INFO
+
+
+def parse_query_response(data: bytes) -> Optional[Tuple[int, Dict[str, str]]]:
+    if len(data) < 5 or data[0] != GAMESPY3_QUERY:
+        return None
+
+    session_id = struct.unpack('>I', data[1:5])[0]
+    payload = data[5:]
+    # Some servers always use the split packet format, which prefixes the payload with packet number and flags
+    if payload.startswith(b'splitnum\x00'):
+        payload = payload[len(b'splitnum\x00') + 2:]
+
+    info = dict()
+    fields = payload.split(b'\x00')
+    for key, value in zip(fields[::2], fields[1::2]):
+        if key == b'':
+            break
+        info[key.decode('latin-1')] = value.decode('latin-1')
+
+    return session_id, info
+
+
+class QueryProtocol(asyncio.DatagramProtocol):
+    pending: Dict[int, asyncio.Future]
+
+    def __init__(self):
+        self.pending = dict()
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        parsed = parse_query_response(data)
+        if parsed is None:
+            return
+
+        session_id, info = parsed
+        future = self.pending.pop(session_id, None)
+        if future is not None and not future.done():
+            future.set_result(info)
+
+    def error_received(self, exc: Exception) -> None:
+        # ICMP port unreachable and the like, probes simply time out instead
+        pass
+
+
+async def probe(transport: asyncio.DatagramTransport, protocol: QueryProtocol, session_id: int,
+                address: str, query_port: int, timeout: float) -> Optional[Dict[str, str]]:
+    future = asyncio.get_running_loop().create_future()
+    protocol.pending[session_id] = future
+    transport.sendto(build_query_packet(session_id), (address, query_port))
+    try:
+        return await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError:
+        return None
+    finally:
+        protocol.pending.pop(session_id, None)
+
+
+async def discover_query_ports_async(servers: Iterable[Tuple[str, int]], candidates: Iterable[int],
+                                     timeout: float, concurrency: int) -> Dict[Tuple[str, int], int]:
+    servers = list(servers)
+    addresses: Set[str] = {address for address, _ in servers}
+    candidates = list(candidates)
+
+    loop = asyncio.get_running_loop()
+    transport, protocol = await loop.create_datagram_endpoint(QueryProtocol, local_addr=('0.0.0.0', 0))
+
+    # Any query port on an address may belong to any of the servers on that address, so probe every candidate
+    # only once per address and map ports to servers via the game port ("hostport") servers report
+    semaphore = asyncio.Semaphore(concurrency)
+    session_ids = itertools.count(1)
+    found: Dict[Tuple[str, int], int] = dict()
+
+    async def probe_candidate(address: str, query_port: int) -> None:
+        async with semaphore:
+            info = await probe(transport, protocol, next(session_ids), address, query_port, timeout)
+        if info is not None and info.get('hostport', '').isdigit():
+            found.setdefault((address, int(info['hostport'])), query_port)
+
+    try:
+        await asyncio.gather(*[
+            probe_candidate(address, query_port)
+            for address in addresses
+            for query_port in candidates
+        ])
+    finally:
+        transport.close()
+
+    return {server: found[server] for server in servers if server in found}
+
+
+def discover_query_ports(servers: Iterable[Tuple[str, int]], candidates: Iterable[int] = DEFAULT_QUERY_PORTS,
+                         timeout: float = 0.5, concurrency: int = 512) -> Dict[Tuple[str, int], int]:
+    return asyncio.run(discover_query_ports_async(servers, candidates, timeout, concurrency))
+
+
+def parse_port_range(value: str) -> List[int]:
+    start, _, end = value.partition('-')
+    return list(range(int(start), int(end or start) + 1))
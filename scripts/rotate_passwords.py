@@ -0,0 +1,108 @@
+import argparse
+import os
+import pathlib
+import sys
+import time
+from typing import Dict
+
+import yaml
+
+from scripts.accounts import connect
+from scripts.cli import add_target_parsers, get_targets
+from scripts.config import get_cache_dir, open_config
+from scripts.credentials import generate_passwords
+
+
+def write_recovery_file(passwords: Dict[str, str]) -> pathlib.Path:
+    # Passwords are secrets, so only ever make the file readable by the current user
+    path = get_cache_dir().joinpath('recovery', f'passwords-{time.strftime("%Y%m%d-%H%M%S")}.yaml')
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as recoveryFile:
+        yaml.safe_dump(passwords, recoveryFile, sort_keys=False)
+    return path
+
+
+parser = argparse.ArgumentParser(description='Rotate passwords of bots in config '
+                                             'and their accounts in MySQL/SQLite table')
+parser.add_argument('--config', help='Path to bot server configs (config.yaml or config directory)', type=str,
+                    required=True)
+parser.add_argument('--server', help='Name or address:port of server to rotate bot passwords for (repeatable)',
+                    type=str, action='append', dest='servers', default=list())
+parser.add_argument('--all', help='Rotate bot passwords for all servers', dest='all_servers', action='store_true')
+parser.add_argument('--length', help='Length of generated passwords', type=int, default=10)
+parser.add_argument('--no-cache', help='Always parse config file instead of using cached, previously parsed config',
+                    dest='cache', action='store_false')
+subparsers = parser.add_subparsers(title='Database backend type', dest='backend', required=True)
+add_target_parsers(subparsers, 'update accounts in')
+args = parser.parse_args()
+
+if not args.all_servers and len(args.servers) == 0:
+    parser.error('either --server or --all is required')
+
+configPath = pathlib.Path(args.config).absolute()
+if not os.path.exists(configPath):
+    print(f'Could not find config file at given path ({configPath})')
+    sys.exit(1)
+
+configFile = open_config(configPath, use_cache=args.cache)
+
+selected = [
+    config for config in configFile.configs
+    if args.all_servers or config.name in args.servers or f'{config.address}:{config.port}' in args.servers
+]
+unknown = set(args.servers) - {config.name for config in selected} - {f'{c.address}:{c.port}' for c in selected}
+if len(unknown) > 0:
+    print(f'Could not find server(s) in config: {", ".join(sorted(unknown))}')
+    sys.exit(1)
+
+bots = [bot for config in selected for bot in config.bots]
+passwords = dict(zip([bot.basename for bot in bots], generate_passwords(len(bots), args.length)))
+
+targets = get_targets(args)
+
+stores = []
+committed = []
+try:
+    for target in targets:
+        stores.append(connect(target))
+
+    # Accounts are shared by all bots with the same basename, including those on servers which were not selected
+    for config in configFile.configs:
+        for bot in config.bots:
+            if bot.basename in passwords:
+                bot.password = passwords[bot.basename]
+
+    # Only swap in the new config once all accounts were updated, so failing to update them leaves it unchanged
+    with configFile.staged_save(use_cache=args.cache):
+        for target, store in zip(targets, stores):
+            updated = store.update_passwords(passwords)
+            print(f'{target}: updating {updated} accounts of {len(passwords)} bots')
+        for target, store in zip(targets, stores):
+            store.connection.commit()
+            committed.append(target)
+except Exception as e:
+    for store in stores[len(committed):]:
+        store.connection.rollback()
+    if len(committed) == 0:
+        print(f'Failed to rotate passwords, neither config nor accounts have been changed ({e})')
+        sys.exit(1)
+
+    # Databases are committed before the config is swapped in, so any failure from here on leaves them diverged
+    print(f'Failed to rotate passwords after committing them to some databases, '
+          f'config and accounts are now out of sync ({e})')
+    print(f'New passwords were already committed to: {", ".join(str(target) for target in committed)}')
+    try:
+        print(f'New passwords were written to {write_recovery_file(passwords)}, '
+              f'please apply them to the config (and any remaining databases) by hand')
+    except OSError as recoveryError:
+        # New passwords must not get lost, even if they can only be shown here
+        print(f'Failed to write new passwords to a recovery file ({recoveryError}), '
+              f'please apply them to the config (and any remaining databases) by hand:')
+        for basename, password in passwords.items():
+            print(f'{basename}: {password}')
+    sys.exit(1)
+finally:
+    for store in stores:
+        store.close()
+
+print(f'Rotated passwords of {len(bots)} bots on {len(selected)} server(s)')
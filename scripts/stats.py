@@ -0,0 +1,78 @@
+import json
+import math
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Generator, List
+
+
+def percentile(ordered: List[float], p: float) -> float:
+    # Nearest-rank percentile of already sorted values
+    return ordered[max(math.ceil(p / 100 * len(ordered)) - 1, 0)]
+
+
+class Stats:
+    # Total seconds spent per phase, in the order phases were first entered
+    spans: Dict[str, float]
+    counters: Dict[str, int]
+    # Individual durations of operations that happen many times (statements, requests)
+    latencies: Dict[str, List[float]]
+
+    lock: threading.Lock
+
+    def __init__(self):
+        self.spans = dict()
+        self.counters = dict()
+        self.latencies = dict()
+        # Names are fetched on worker threads, so updates must not interleave
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str) -> Generator[None, None, None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                self.spans[name] = self.spans.get(name, 0.0) + elapsed
+
+    @contextmanager
+    def timed(self, name: str) -> Generator[None, None, None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self.lock:
+            self.latencies.setdefault(name, list()).append(seconds)
+
+    def count(self, name: str, value: int = 1) -> None:
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def dump(self) -> dict:
+        with self.lock:
+            latencies = {name: sorted(values) for (name, values) in self.latencies.items()}
+            return {
+                'spans': dict(self.spans),
+                'counters': dict(self.counters),
+                'latencies': {
+                    name: {
+                        'count': len(ordered),
+                        'total': sum(ordered),
+                        'p50': percentile(ordered, 50),
+                        'p99': percentile(ordered, 99),
+                        'max': ordered[-1]
+                    }
+                    for (name, ordered) in latencies.items()
+                }
+            }
+
+
+def print_stats(stats: dict) -> None:
+    json.dump(stats, sys.stdout, indent=2)
+    print()
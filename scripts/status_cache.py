@@ -0,0 +1,115 @@
+import datetime
+import ipaddress
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import redis
+
+from scripts.types import ServerConfig
+
+# Defaults as per src/config.ts, so scripts share the manager's cache when run in the same environment
+REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost')
+REDIS_KEY_PREFIX = os.environ.get('REDIS_KEY_PREFIX', '')
+STATUS_CACHE_TTL = int(os.environ.get('STATUS_CACHE_TTL', 18))
+
+BFLIST_API_URL = 'https://api.bflist.io/bf2/v1/servers'
+GAMEDIG_TYPE = 'battlefield2'
+
+
+@dataclass
+class CachedJSON:
+    data: Any
+    as_of: datetime.datetime
+
+    @staticmethod
+    def parse(unparsed: str) -> 'CachedJSON':
+        parsed = json.loads(unparsed)
+        as_of = parsed.get('asOf')
+        return CachedJSON(
+            data=parsed.get('data'),
+            as_of=datetime.datetime.fromisoformat(as_of) if as_of else datetime.datetime.now(datetime.timezone.utc)
+        )
+
+    def dump(self) -> str:
+        # Same format as moment's JSON serialization (UTC with milliseconds)
+        as_of = self.as_of.astimezone(datetime.timezone.utc)
+        return json.dumps({
+            'data': self.data,
+            'asOf': as_of.strftime('%Y-%m-%dT%H:%M:%S.') + f'{as_of.microsecond // 1000:03d}Z'
+        }, separators=(',', ':'))
+
+
+def get_http_key(url: str) -> str:
+    return f'get:{url}'
+
+
+def get_query_key(query_type: str, host: str, port: int) -> str:
+    return f'query:{query_type}:{host}:{port}'
+
+
+def should_query_directly(config: ServerConfig) -> bool:
+    return not ipaddress.ip_address(config.address).is_global or bool(config.query_directly)
+
+
+def get_bflist_url(config: ServerConfig) -> str:
+    return f'{BFLIST_API_URL}/{config.address}:{config.port}'
+
+
+def get_status_key(config: ServerConfig) -> str:
+    # Same key the manager uses for the server, depending on whether it queries the server directly or via bflist
+    if should_query_directly(config):
+        return get_query_key(GAMEDIG_TYPE, config.address, config.query_port)
+    return get_http_key(get_bflist_url(config))
+
+
+class StatusCache:
+    client: redis.Redis
+    prefix: str
+
+    def __init__(self, client: redis.Redis, prefix: str = REDIS_KEY_PREFIX):
+        self.client = client
+        self.prefix = prefix
+
+    @staticmethod
+    def connect(url: str = REDIS_URL, prefix: str = REDIS_KEY_PREFIX) -> 'StatusCache':
+        return StatusCache(redis.Redis.from_url(url), prefix)
+
+    def close(self) -> None:
+        self.client.close()
+
+    def get_many(self, keys: List[str]) -> Dict[str, Optional[CachedJSON]]:
+        if len(keys) == 0:
+            return dict()
+
+        # Fetch all keys in a single round trip
+        values = self.client.mget([self.prefix + key for key in keys])
+        return {
+            key: CachedJSON.parse(value) if value is not None else None
+            for (key, value) in zip(keys, values)
+        }
+
+    def set_many(self, items: Dict[str, Any], ttl: int = STATUS_CACHE_TTL,
+                 as_of: Optional[datetime.datetime] = None) -> None:
+        if len(items) == 0:
+            return
+
+        as_of = as_of or datetime.datetime.now(datetime.timezone.utc)
+        # Queue all writes and send them in a single round trip (no MULTI/EXEC needed, keys are independent)
+        pipeline = self.client.pipeline(transaction=False)
+        for (key, data) in items.items():
+            pipeline.setex(self.prefix + key, ttl, CachedJSON(data, as_of).dump())
+        pipeline.execute()
+
+    def get(self, key: str) -> Optional[CachedJSON]:
+        return self.get_many([key])[key]
+
+    def set(self, key: str, data: Any, ttl: int = STATUS_CACHE_TTL) -> None:
+        self.set_many({key: data}, ttl)
+
+    def get_statuses(self, configs: List[ServerConfig]) -> Dict[str, Optional[CachedJSON]]:
+        # Servers queried directly without a query port cannot be looked up (nor can the manager query them)
+        keys = [get_status_key(config) for config in configs
+                if not should_query_directly(config) or config.query_port is not None]
+        return self.get_many(keys)
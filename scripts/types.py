@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import Optional, List
 
 
-@dataclass
+@dataclass(slots=True)
 class BotConfig:
     basename: str
     password: str
@@ -21,7 +21,7 @@ class BotConfig:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ServerConfig:
     name: str
     address: str
@@ -34,6 +34,7 @@ class ServerConfig:
     autobalance: Optional[bool] = None
     query_directly: Optional[bool] = None
     rotate_bot_names: Optional[bool] = None
+    bot_name_suffixes: Optional[int] = None
 
     @staticmethod
     def load(data: dict) -> 'ServerConfig':
@@ -48,7 +49,8 @@ class ServerConfig:
             query_port=data.get('queryPort'),
             autobalance=data.get('autobalance'),
             query_directly=data.get('queryDirectly'),
-            rotate_bot_names=data.get('rotateBotNames')
+            rotate_bot_names=data.get('rotateBotNames'),
+            bot_name_suffixes=data.get('botNameSuffixes')
         )
 
     def dump(self) -> dict:
@@ -65,6 +67,7 @@ class ServerConfig:
                 'autobalance': self.autobalance,
                 'queryDirectly': self.query_directly,
                 'rotateBotNames': self.rotate_bot_names,
+                'botNameSuffixes': self.bot_name_suffixes,
                 'bots': [bot_config.dump() for bot_config in self.bots]
             }.items()
             if value is not None
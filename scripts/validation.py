@@ -0,0 +1,233 @@
+import json
+import pathlib
+import re
+from functools import lru_cache
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+from scripts.config import ConfigDirectory, ConfigFile
+from scripts.types import ServerConfig
+
+SCHEMA_PATH = pathlib.Path(__file__).absolute().parent.parent.joinpath('config.schema.json')
+# Names must leave space for 2 character name suffix ("^{number}")
+MAX_BASENAME_LENGTH = 16
+
+# Checks append an error to the given list for every problem they find, so all errors can be reported at once
+# Paths are only formatted if there is an error to report, since most values are valid
+Path = Tuple[Any, ...]
+Check = Callable[[Any, Path, List[str]], None]
+
+JSON_TYPES = {
+    'string': (str,),
+    'number': (int, float),
+    'integer': (int,),
+    'boolean': (bool,),
+    'object': (dict,),
+    'array': (list,)
+}
+
+
+def format_path(path: Path) -> str:
+    parts = []
+    while len(path) == 2:
+        path, key = path
+        parts.append(f'[{key}]' if isinstance(key, int) else f'.{key}')
+    return path[0] + ''.join(reversed(parts))
+
+
+def get_unique_key(item: Any) -> Any:
+    # Flat objects (such as bots) can be compared by their items, serializing is faster for anything nested
+    try:
+        key = tuple(sorted(item.items())) if isinstance(item, dict) else item
+        hash(key)
+        return key
+    except TypeError:
+        return json.dumps(item, sort_keys=True)
+
+
+def compile_type(name: str) -> Check:
+    types = JSON_TYPES[name]
+
+    def check(value: Any, path: Path, errors: List[str]) -> None:
+        # bool is a subclass of int in Python, but not a number in JSON
+        if not isinstance(value, types) or isinstance(value, bool) and bool not in types:
+            errors.append(f'{format_path(path)}: must be of type {name}')
+
+    return check
+
+
+def compile_schema(schema: dict) -> Check:
+    # Compile each keyword into a check once, so validating does not have to interpret the schema over and over again.
+    # Only the keywords used by config.schema.json are supported, annotations (description etc.) are ignored.
+    checks: List[Check] = []
+
+    if 'type' in schema:
+        checks.append(compile_type(schema['type']))
+
+    if 'const' in schema:
+        const = schema['const']
+
+        def check_const(value: Any, path: Path, errors: List[str]) -> None:
+            if value != const or type(value) is not type(const):
+                errors.append(f'{format_path(path)}: must be {json.dumps(const)}')
+
+        checks.append(check_const)
+
+    if 'pattern' in schema:
+        pattern = re.compile(schema['pattern'])
+
+        def check_pattern(value: Any, path: Path, errors: List[str]) -> None:
+            if isinstance(value, str) and pattern.search(value) is None:
+                errors.append(f'{format_path(path)}: must match pattern {pattern.pattern}')
+
+        checks.append(check_pattern)
+
+    if 'multipleOf' in schema:
+        divisor = schema['multipleOf']
+
+        def check_multiple_of(value: Any, path: Path, errors: List[str]) -> None:
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and value % divisor != 0:
+                errors.append(f'{format_path(path)}: must be a multiple of {divisor}')
+
+        checks.append(check_multiple_of)
+
+    if 'minimum' in schema:
+        minimum = schema['minimum']
+
+        def check_minimum(value: Any, path: Path, errors: List[str]) -> None:
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and value < minimum:
+                errors.append(f'{format_path(path)}: must be at least {minimum}')
+
+        checks.append(check_minimum)
+
+    if 'maximum' in schema:
+        maximum = schema['maximum']
+
+        def check_maximum(value: Any, path: Path, errors: List[str]) -> None:
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and value > maximum:
+                errors.append(f'{format_path(path)}: must be at most {maximum}')
+
+        checks.append(check_maximum)
+
+    if 'minItems' in schema:
+        min_items = schema['minItems']
+
+        def check_min_items(value: Any, path: Path, errors: List[str]) -> None:
+            if isinstance(value, list) and len(value) < min_items:
+                errors.append(f'{format_path(path)}: must contain at least {min_items} item(s)')
+
+        checks.append(check_min_items)
+
+    if schema.get('uniqueItems', False):
+        def check_unique_items(value: Any, path: Path, errors: List[str]) -> None:
+            if not isinstance(value, list):
+                return
+            seen = set()
+            for (i, item) in enumerate(value):
+                key = get_unique_key(item)
+                if key in seen:
+                    errors.append(f'{format_path((path, i))}: must be unique')
+                seen.add(key)
+
+        checks.append(check_unique_items)
+
+    if 'required' in schema:
+        required = schema['required']
+
+        def check_required(value: Any, path: Path, errors: List[str]) -> None:
+            if isinstance(value, dict):
+                for key in required:
+                    if key not in value:
+                        errors.append(f'{format_path((path, key))}: is required')
+
+        checks.append(check_required)
+
+    if 'properties' in schema:
+        properties = {key: compile_schema(subschema) for (key, subschema) in schema['properties'].items()}
+
+        def check_properties(value: Any, path: Path, errors: List[str]) -> None:
+            if isinstance(value, dict):
+                for (key, check) in properties.items():
+                    if key in value:
+                        check(value[key], (path, key), errors)
+
+        checks.append(check_properties)
+
+    if 'items' in schema:
+        items = compile_schema(schema['items'])
+
+        def check_items(value: Any, path: Path, errors: List[str]) -> None:
+            if isinstance(value, list):
+                for (i, item) in enumerate(value):
+                    items(item, (path, i), errors)
+
+        checks.append(check_items)
+
+    if 'not' in schema:
+        negated = compile_schema(schema['not'])
+
+        def check_not(value: Any, path: Path, errors: List[str]) -> None:
+            if is_valid(negated, value, path):
+                errors.append(f'{format_path(path)}: must not match schema')
+
+        checks.append(check_not)
+
+    if 'if' in schema:
+        condition = compile_schema(schema['if'])
+        then = compile_schema(schema.get('then', dict()))
+        otherwise = compile_schema(schema.get('else', dict()))
+
+        def check_if(value: Any, path: Path, errors: List[str]) -> None:
+            if is_valid(condition, value, path):
+                then(value, path, errors)
+            else:
+                otherwise(value, path, errors)
+
+        checks.append(check_if)
+
+    checks.extend(compile_schema(subschema) for subschema in schema.get('allOf', list()))
+
+    if len(checks) == 1:
+        return checks[0]
+
+    def check(value: Any, path: Path, errors: List[str]) -> None:
+        for c in checks:
+            c(value, path, errors)
+
+    return check
+
+
+def is_valid(check: Check, value: Any, path: Path) -> bool:
+    errors = list()
+    check(value, path, errors)
+    return len(errors) == 0
+
+
+@lru_cache(maxsize=None)
+def get_schema_check(schema_path: pathlib.Path = SCHEMA_PATH) -> Check:
+    with open(schema_path, 'r') as schemaFile:
+        return compile_schema(json.load(schemaFile))
+
+
+def validate_configs(configs: List[ServerConfig], data: List[Any],
+                     overpopulate_factor: Optional[int] = None) -> List[str]:
+    # Schema is checked against the data as parsed, since loading configs fills in defaults for any missing values
+    errors = list()
+    get_schema_check()(data, ('$',), errors)
+
+    # Invariants the manager relies on which cannot be expressed in the schema
+    for (i, config) in enumerate(configs):
+        if overpopulate_factor is not None and len(config.bots) < config.slots * overpopulate_factor:
+            errors.append(f'$[{i}].bots: must contain at least {config.slots * overpopulate_factor} bots to fill '
+                          f'{config.slots} slots with overpopulate factor {overpopulate_factor} '
+                          f'(has {len(config.bots)})')
+        for (j, bot) in enumerate(config.bots):
+            if len(bot.basename) > MAX_BASENAME_LENGTH:
+                errors.append(f'$[{i}].bots[{j}].basename: must be at most {MAX_BASENAME_LENGTH} characters long')
+
+    return errors
+
+
+def validate_config_file(config_file: Union[ConfigFile, ConfigDirectory],
+                         overpopulate_factor: Optional[int] = None) -> List[str]:
+    configs = config_file.configs
+    return validate_configs(configs, [config_file.get_data(config) for config in configs], overpopulate_factor)
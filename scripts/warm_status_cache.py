@@ -0,0 +1,72 @@
+import argparse
+import os
+import pathlib
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from scripts.config import load_configs
+from scripts.status_cache import REDIS_KEY_PREFIX, REDIS_URL, STATUS_CACHE_TTL, StatusCache, get_bflist_url, \
+    get_http_key, should_query_directly
+
+
+def fetch(session: requests.Session, url: str, timeout: float) -> Tuple[str, Optional[Any]]:
+    try:
+        resp = session.get(url, timeout=timeout)
+        if resp.ok:
+            return url, resp.json()
+    except (requests.RequestException, ValueError):
+        pass
+    return url, None
+
+
+parser = argparse.ArgumentParser(description='Pre-warm the manager\'s Redis status cache with bflist server status '
+                                             'for all servers in config')
+parser.add_argument('--config', help='Path to bot server configs (config.yaml or config directory)', type=str,
+                    required=True)
+parser.add_argument('--redis-url', help='URL of Redis instance used by the manager', type=str, default=REDIS_URL)
+parser.add_argument('--redis-key-prefix', help='Prefix the manager uses for Redis keys', type=str,
+                    default=REDIS_KEY_PREFIX)
+parser.add_argument('--ttl', help='Seconds to cache server status for', type=int, default=STATUS_CACHE_TTL)
+parser.add_argument('--timeout', help='Seconds to wait for a response from the bflist API', type=float, default=2)
+parser.add_argument('--concurrency', help='Number of requests to the bflist API to keep in flight', type=int,
+                    default=8)
+parser.add_argument('--force', help='Fetch status of all servers, even if already cached', action='store_true')
+parser.add_argument('--no-cache', help='Always parse config file instead of using cached, previously parsed config',
+                    dest='cache', action='store_false')
+args = parser.parse_args()
+
+configPath = pathlib.Path(args.config).absolute()
+if not os.path.exists(configPath):
+    print(f'Could not find config file at given path ({configPath})')
+    sys.exit(1)
+
+configs = load_configs(configPath, use_cache=args.cache)
+# Servers which are queried directly are cached as gamedig results, which only the manager can produce
+bflistConfigs = [config for config in configs if not should_query_directly(config)]
+urls = [get_bflist_url(config) for config in bflistConfigs]
+
+statusCache = StatusCache.connect(args.redis_url, args.redis_key_prefix)
+try:
+    cached = statusCache.get_many([get_http_key(url) for url in urls]) if not args.force else dict()
+    missing = [url for url in urls if cached.get(get_http_key(url)) is None]
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=args.concurrency)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        fetched = dict(executor.map(lambda url: fetch(session, url, args.timeout), missing))
+
+    statusCache.set_many({get_http_key(url): data for (url, data) in fetched.items() if data is not None}, args.ttl)
+finally:
+    statusCache.close()
+
+failed = [url for (url, data) in fetched.items() if data is None]
+print(f'Cached status of {len(missing) - len(failed)} servers ({len(urls) - len(missing)} already cached, '
+      f'{len(failed)} failed, {len(configs) - len(bflistConfigs)} queried directly by manager)')
+for url in failed:
+    print(f'Failed to fetch {url}')
@@ -0,0 +1,136 @@
+import argparse
+import itertools
+import json
+import os
+import pathlib
+import sys
+from typing import List
+
+import numpy as np
+
+from scripts.config import load_configs
+from simulator.engine import Results, simulate
+from simulator.model import ManagerSettings, Scenario
+
+
+def summarize(values: np.ndarray) -> dict:
+    finite = values[np.isfinite(values)]
+    if len(finite) == 0:
+        return {'count': len(values), 'missing': len(values)}
+
+    p50, p90, p99 = np.percentile(finite, [50, 90, 99])
+    return {
+        'count': len(values),
+        'missing': len(values) - len(finite),
+        'mean': float(finite.mean()),
+        'p50': float(p50),
+        'p90': float(p90),
+        'p99': float(p99),
+        'max': float(finite.max())
+    }
+
+
+def summarize_results(results: Results) -> dict:
+    hours = results.duration / 3600
+    return {
+        'timeToFill': summarize(results.time_to_fill),
+        'launchesPerHour': summarize(results.launches / hours),
+        'killsPerHour': summarize(results.kills / hours),
+        'slotReleaseLatency': summarize(results.slot_release_latency),
+        'fillRatio': summarize(results.fill_ratio)
+    }
+
+
+def format_percentiles(summary: dict, unit: str = '') -> str:
+    if 'p50' not in summary:
+        return 'n/a'
+    return f'{summary["p50"]:.0f}{unit}/{summary["p90"]:.0f}{unit}/{summary["p99"]:.0f}{unit}'
+
+
+parser = argparse.ArgumentParser(description='Simulate bot maintenance for a server from the config with different '
+                                             'manager settings')
+parser.add_argument('--config', help='Path to bot server configs (config.yaml or config directory)', type=str,
+                    required=True)
+parser.add_argument('--server', help='Name of server to simulate (required if config contains multiple servers)',
+                    type=str)
+parser.add_argument('--bots', help='Number of bots to simulate (instead of the number of bots in the config)', type=int)
+parser.add_argument('--trials', help='Number of trials to simulate per combination of settings', type=int,
+                    default=1000)
+parser.add_argument('--duration', help='Seconds to simulate per trial', type=float, default=4 * 60 * 60)
+parser.add_argument('--tick', help='Seconds to advance the simulation by per step', type=float, default=5)
+parser.add_argument('--seed', help='Seed for random number generator', type=int, default=0)
+parser.add_argument('--max-players', help='Maximum number of players on the server', type=int, default=64)
+parser.add_argument('--join-failure-probability', help='Probability of a launched bot never joining the server',
+                    type=float, default=0.1)
+parser.add_argument('--join-delay-min', help='Minimum seconds it takes a bot to join', type=float, default=30)
+parser.add_argument('--join-delay-max', help='Maximum seconds it takes a bot to join', type=float, default=90)
+parser.add_argument('--drop-out-probability', help='Probability of a bot dropping off the server within a minute',
+                    type=float, default=0.01)
+parser.add_argument('--player-arrival-rate', help='Average number of players joining per minute', type=float,
+                    default=0.2)
+parser.add_argument('--player-session-length', help='Average number of minutes players stay on the server',
+                    type=float, default=30)
+# Manager settings accept multiple values, every combination of them is simulated
+parser.add_argument('--overpopulate-factor', help='OVERPOPULATE_FACTOR value(s) to simulate', type=int, nargs='+',
+                    default=[ManagerSettings.overpopulate_factor])
+parser.add_argument('--bot-launch-interval', help='BOT_LAUNCH_INTERVAL value(s) to simulate', type=float, nargs='+',
+                    default=[ManagerSettings.bot_launch_interval])
+parser.add_argument('--bot-join-timeout', help='BOT_JOIN_TIMEOUT value(s) to simulate', type=float, nargs='+',
+                    default=[ManagerSettings.bot_join_timeout])
+parser.add_argument('--reserved-slot-timeout', help='RESERVED_SLOT_TIMEOUT value(s) to simulate', type=float,
+                    nargs='+', default=[ManagerSettings.reserved_slot_timeout])
+parser.add_argument('--json', help='Print results as JSON', action='store_true')
+args = parser.parse_args()
+
+configPath = pathlib.Path(args.config).absolute()
+if not os.path.exists(configPath):
+    print(f'Could not find config file at given path ({configPath})')
+    sys.exit(1)
+
+configs = load_configs(configPath)
+if args.server is None and len(configs) != 1:
+    parser.error('--server is required if config contains multiple servers')
+config = next((config for config in configs if args.server is None or config.name == args.server), None)
+if config is None:
+    print(f'Could not find server in config: {args.server}')
+    sys.exit(1)
+
+scenario = Scenario.from_config(
+    config,
+    bots=args.bots,
+    max_players=args.max_players,
+    join_failure_probability=args.join_failure_probability,
+    join_delay_min=args.join_delay_min,
+    join_delay_max=args.join_delay_max,
+    drop_out_probability=args.drop_out_probability,
+    player_arrival_rate=args.player_arrival_rate,
+    player_session_length=args.player_session_length
+)
+
+output: List[dict] = []
+for factor, interval, joinTimeout, slotTimeout in itertools.product(args.overpopulate_factor,
+                                                                    args.bot_launch_interval, args.bot_join_timeout,
+                                                                    args.reserved_slot_timeout):
+    settings = ManagerSettings(
+        overpopulate_factor=factor,
+        bot_launch_interval=interval,
+        bot_join_timeout=joinTimeout,
+        reserved_slot_timeout=slotTimeout
+    )
+    # Use the same seed for every combination, so differences are down to the settings rather than chance
+    summary = summarize_results(simulate(scenario, settings, args.trials, args.duration, args.tick, args.seed))
+    output.append({'settings': settings.dump(), **summary})
+
+    if not args.json:
+        print(f'OVERPOPULATE_FACTOR={factor} BOT_LAUNCH_INTERVAL={interval:g} BOT_JOIN_TIMEOUT={joinTimeout:g} '
+              f'RESERVED_SLOT_TIMEOUT={slotTimeout:g}')
+        print(f'  time to fill (p50/p90/p99): {format_percentiles(summary["timeToFill"], "s")}, '
+              f'never filled in {summary["timeToFill"]["missing"]} of {args.trials} trials')
+        print(f'  launches/kills per hour (p50): {summary["launchesPerHour"]["p50"]:.1f}/'
+              f'{summary["killsPerHour"]["p50"]:.1f}')
+        print(f'  slot release latency (p50/p90/p99): {format_percentiles(summary["slotReleaseLatency"], "s")} '
+              f'over {summary["slotReleaseLatency"]["count"]} releases')
+        print(f'  time filled (p50): {summary["fillRatio"]["p50"] * 100:.1f}%')
+
+if args.json:
+    print(json.dumps(output, indent=2))
@@ -0,0 +1,304 @@
+import math
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from simulator.model import ManagerSettings, Scenario
+
+# Seconds within each minute at which the slot maintenance (team balance and reserved slot checks) runs
+SLOT_MAINTENANCE_SECONDS = (10, 30, 50)
+# Interval in seconds in which the bot maintenance runs
+BOT_MAINTENANCE_INTERVAL = 120
+
+
+@dataclass
+class Results:
+    # Seconds until bots first filled all slots for each trial (nan if they never did)
+    time_to_fill: np.ndarray
+    # Number of bot processes (re-)launched and killed for each trial
+    launches: np.ndarray
+    kills: np.ndarray
+    # Seconds players had to wait for bots to free up reserved slots, for every time they had to (across all trials)
+    slot_release_latency: np.ndarray
+    # Share of the simulated time the desired number of slots was filled with bots for each trial
+    fill_ratio: np.ndarray
+    duration: float
+
+
+class State:
+    # All trials are simulated in lockstep: per-bot state is kept in (trials, bots) arrays, per-server state in
+    # (trials,) arrays. Bots are modified via (trial indices, bot indices) pairs, which keep the counters in sync.
+    def __init__(self, trials: int, bots: int, slots: int):
+        self.trials = trials
+        self.enabled = np.zeros((trials, bots), dtype=bool)
+        self.running = np.zeros((trials, bots), dtype=bool)
+        self.started_at = np.full((trials, bots), np.nan)
+        self.join_at = np.full((trials, bots), np.inf)
+        self.on_server = np.zeros((trials, bots), dtype=bool)
+        self.team = np.zeros((trials, bots), dtype=np.int8)
+        self.last_seen_at = np.full((trials, bots), np.nan)
+
+        # Number of enabled bots, enabled bots on server (by team) and any bots on server (by team)
+        self.population = np.zeros(trials, dtype=np.int64)
+        self.filled_by_team = np.zeros((trials, 2), dtype=np.int64)
+        self.bots_by_team = np.zeros((trials, 2), dtype=np.int64)
+        self.players_by_team = np.zeros((trials, 2), dtype=np.int64)
+
+        self.current_slots = np.full(trials, slots, dtype=np.int64)
+        self.slots_taken_since = np.full(trials, np.nan)
+        self.slots_free_since = np.full(trials, np.nan)
+        self.autobalance_in_progress = np.zeros(trials, dtype=bool)
+        self.autobalance_started_at = np.full(trials, np.nan)
+
+        # Index of the next bot to maintain in the currently running bot maintenance (-1 if not running)
+        self.cursor = np.full(trials, -1, dtype=np.int64)
+        self.busy_until = np.zeros(trials)
+
+        self.launches = np.zeros(trials, dtype=np.int64)
+        self.kills = np.zeros(trials, dtype=np.int64)
+
+    def count(self, idx: np.ndarray, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        # Trials may occur multiple times in idx, so sum up per trial rather than using fancy index assignments
+        return np.bincount(idx if mask is None else idx[mask], minlength=self.trials)
+
+    def count_by_team(self, idx: np.ndarray, team: np.ndarray, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        # Count per (trial, team) pair, bots without a team (0) are dropped afterwards
+        keys = idx * 3 + team if mask is None else (idx * 3 + team)[mask]
+        return np.bincount(keys, minlength=self.trials * 3).reshape(self.trials, 3)[:, 1:]
+
+    def set_enabled(self, idx: np.ndarray, b: np.ndarray, enabled: bool) -> None:
+        changed = self.enabled[idx, b] != enabled
+        idx, b = idx[changed], b[changed]
+        sign = 1 if enabled else -1
+        self.population += sign * self.count(idx)
+        self.filled_by_team += sign * self.count_by_team(idx, self.team[idx, b], self.on_server[idx, b])
+        self.enabled[idx, b] = enabled
+
+    def join(self, idx: np.ndarray, b: np.ndarray, team: np.ndarray, now: float) -> None:
+        self.on_server[idx, b] = True
+        self.team[idx, b] = team
+        self.last_seen_at[idx, b] = now
+        self.bots_by_team += self.count_by_team(idx, team)
+        self.filled_by_team += self.count_by_team(idx, team, self.enabled[idx, b])
+
+    def leave(self, idx: np.ndarray, b: np.ndarray, now: float) -> None:
+        on = self.on_server[idx, b]
+        idx, b = idx[on], b[on]
+        team = self.team[idx, b]
+        self.bots_by_team -= self.count_by_team(idx, team)
+        self.filled_by_team -= self.count_by_team(idx, team, self.enabled[idx, b])
+        self.on_server[idx, b] = False
+        self.team[idx, b] = 0
+        self.last_seen_at[idx, b] = now
+
+    def launch(self, idx: np.ndarray, b: np.ndarray, now: float, scenario: Scenario,
+               rng: np.random.Generator) -> None:
+        delay = rng.uniform(scenario.join_delay_min, scenario.join_delay_max, len(idx))
+        fails = rng.random(len(idx)) < scenario.join_failure_probability
+        self.running[idx, b] = True
+        self.started_at[idx, b] = now
+        self.join_at[idx, b] = np.where(fails, np.inf, now + delay)
+        self.launches += self.count(idx)
+
+    def kill(self, idx: np.ndarray, b: np.ndarray, now: float) -> None:
+        self.leave(idx, b, now)
+        self.running[idx, b] = False
+        self.started_at[idx, b] = np.nan
+        self.join_at[idx, b] = np.inf
+        self.kills += self.count(idx)
+
+
+def elapsed(now: float, since: np.ndarray) -> np.ndarray:
+    # moment().diff(undefined) is 0, so unset timestamps count as no time having passed
+    return np.where(np.isnan(since), 0, now - since)
+
+
+def get_available_slots(state: State, scenario: Scenario) -> np.ndarray:
+    raw = np.maximum(0, scenario.max_players - state.players_by_team.sum(axis=1) - scenario.reserved_slots)
+    return raw - raw % 2
+
+
+def update_players(state: State, scenario: Scenario, tick: float, rng: np.random.Generator) -> None:
+    leave = 1 - math.exp(-tick / (scenario.player_session_length * 60))
+    state.players_by_team -= rng.binomial(state.players_by_team, leave)
+
+    # Players can only join if the server is not full and always join the smaller team
+    free = scenario.max_players - state.players_by_team.sum(axis=1) - state.bots_by_team.sum(axis=1)
+    arrivals = np.minimum(rng.poisson(scenario.player_arrival_rate * tick / 60, state.trials), np.maximum(free, 0))
+    totals = state.players_by_team + state.bots_by_team
+    first = np.clip((arrivals + totals[:, 1] - totals[:, 0] + rng.integers(0, 2, state.trials)) // 2, 0, arrivals)
+    state.players_by_team[:, 0] += first
+    state.players_by_team[:, 1] += arrivals - first
+
+
+def update_bots(state: State, scenario: Scenario, now: float, tick: float, rng: np.random.Generator) -> None:
+    # Bots drop off the server at random, their process remains running until it is killed due to the join timeout
+    drop = 1 - (1 - scenario.drop_out_probability) ** (tick / 60)
+    idx, b = np.nonzero(state.on_server & (rng.random(state.on_server.shape) < drop))
+    state.leave(idx, b, now)
+    state.join_at[idx, b] = np.inf
+    state.last_seen_at[state.on_server] = now
+
+    # Bots join the smaller team one after another, unless the server is full
+    joining = state.running & ~state.on_server & (state.join_at <= now)
+    for bot in np.nonzero(joining.any(axis=0))[0]:
+        idx = np.nonzero(joining[:, bot])[0]
+        totals = state.players_by_team[idx] + state.bots_by_team[idx]
+        full = totals.sum(axis=1) >= scenario.max_players
+        state.join_at[idx[full], bot] = np.inf
+        idx, totals = idx[~full], totals[~full]
+        tie = rng.integers(1, 3, len(idx))
+        team = np.where(totals[:, 0] < totals[:, 1], 1, np.where(totals[:, 0] > totals[:, 1], 2, tie))
+        state.join(idx, np.full(len(idx), bot), team.astype(np.int8), now)
+
+
+def ensure_team_balance(state: State, scenario: Scenario, settings: ManagerSettings, now: float) -> None:
+    if not scenario.autobalance:
+        return
+
+    bots = state.bots_by_team.sum(axis=1)
+    delta = np.abs(state.bots_by_team[:, 0] - state.bots_by_team[:, 1])
+    players_delta = np.abs(state.players_by_team[:, 0] - state.players_by_team[:, 1])
+    settled = (bots == state.current_slots) & (delta == 0) & state.autobalance_in_progress
+
+    start = (bots == state.current_slots) & (delta > 0)
+    complete = settled & (players_delta == 0)
+    abort = settled & ~complete & (elapsed(now, state.autobalance_started_at) > settings.autobalance_max_duration)
+
+    state.autobalance_in_progress[start] = True
+    state.autobalance_started_at[start] = now
+    state.current_slots[start] = np.minimum(state.bots_by_team[start].min(axis=1) * 2, scenario.slots)
+    state.autobalance_in_progress[complete | abort] = False
+    state.autobalance_started_at[complete | abort] = np.nan
+
+
+def ensure_reserved_slots(state: State, scenario: Scenario, settings: ManagerSettings, now: float,
+                          initial_check: bool = False) -> None:
+    available = get_available_slots(state, scenario)
+    current = state.current_slots
+
+    decrease = available < current
+    decrease_now = decrease & (initial_check | (elapsed(now, state.slots_taken_since) > settings.bot_slot_timeout))
+    decrease_later = decrease & ~decrease_now & np.isnan(state.slots_taken_since)
+
+    increase = ~decrease & (available > current) & (current < scenario.slots) & ~state.autobalance_in_progress
+    increase_now = increase & (elapsed(now, state.slots_free_since) > settings.reserved_slot_timeout)
+    increase_later = increase & ~increase_now & np.isnan(state.slots_free_since)
+
+    freed = ~decrease & ~increase & (available == current) & ~np.isnan(state.slots_taken_since)
+    taken = ~decrease & ~increase & ~freed & (available == current) & ~np.isnan(state.slots_free_since) \
+        & ~state.autobalance_in_progress
+
+    state.current_slots = np.where(decrease_now, available,
+                                   np.where(increase_now, np.minimum(available, scenario.slots), current))
+    state.slots_taken_since[decrease_now | freed] = np.nan
+    state.slots_taken_since[decrease_later] = now
+    state.slots_free_since[increase_now | taken] = np.nan
+    state.slots_free_since[increase_later] = now
+
+
+def maintain_bots(state: State, scenario: Scenario, settings: ManagerSettings, now: float,
+                  rng: np.random.Generator) -> None:
+    # Bots are maintained one after another, waiting for the launch interval after every (re-)launch. So advance each
+    # trial's maintenance until it either waits for a launch interval to pass or has maintained all bots.
+    bots = state.enabled.shape[1]
+    while True:
+        idx = np.nonzero((state.cursor >= 0) & (state.busy_until <= now))[0]
+        if len(idx) == 0:
+            break
+
+        b = state.cursor[idx]
+        slots = state.current_slots[idx]
+        enabled = state.enabled[idx, b]
+        on_server = state.on_server[idx, b]
+        filled_by_team = state.filled_by_team[idx]
+        filled = filled_by_team.sum(axis=1)
+        population = state.population[idx]
+        max_population = slots * settings.overpopulate_factor
+        team = state.team[idx, b]
+        own_team_size = np.where(team > 0, filled_by_team[np.arange(len(idx)), np.maximum(team - 1, 0)],
+                                 filled_by_team.min(axis=1))
+
+        enable = ~enabled & (filled < slots) & (population < max_population)
+        disable = enabled & on_server & (own_team_size > slots / 2) & (filled > slots)
+        disable |= enabled & ~on_server & (population > max_population)
+        disable |= enabled & ~on_server & (filled == slots)
+        state.set_enabled(idx[enable], b[enable], True)
+        state.set_enabled(idx[disable], b[disable], False)
+
+        enabled = state.enabled[idx, b]
+        running = state.running[idx, b]
+        last_seen_at = state.last_seen_at[idx, b]
+        relaunch = enabled & ~running
+        stop = ~enabled & running
+        timed_out = enabled & ~on_server & running & (now - state.started_at[idx, b] > settings.bot_join_timeout) \
+            & (np.isnan(last_seen_at) | (now - last_seen_at > settings.bot_on_server_timeout))
+
+        state.launch(idx[relaunch], b[relaunch], now, scenario, rng)
+        state.kill(idx[stop | timed_out], b[stop | timed_out], now)
+        state.busy_until[idx[relaunch]] = now + settings.bot_launch_interval
+
+        state.cursor[idx] = np.where(b + 1 < bots, b + 1, -1)
+
+
+def simulate(scenario: Scenario, settings: ManagerSettings, trials: int = 1000, duration: float = 4 * 60 * 60,
+             tick: float = 5, seed: int = 0) -> Results:
+    if 10 % tick != 0:
+        raise ValueError('Tick must evenly divide 10 seconds in order to hit all maintenance schedules')
+
+    rng = np.random.default_rng(seed)
+    state = State(trials, scenario.bots, scenario.slots)
+
+    # Mirror BotManager: check reserved slots once, then launch as many bots as there are slots to fill
+    ensure_reserved_slots(state, scenario, settings, 0, initial_check=True)
+    launching = min(int(state.current_slots[0]), scenario.bots)
+    launch_complete = launching * settings.bot_launch_interval
+    launched = 0
+
+    time_to_fill = np.full(trials, np.nan)
+    filled_time = np.zeros(trials)
+    release_pending_since = np.full(trials, np.nan)
+    release_latencies: List[np.ndarray] = []
+    everyone = np.arange(trials)
+
+    for step in range(int(duration / tick) + 1):
+        now = step * tick
+
+        update_players(state, scenario, tick, rng)
+        update_bots(state, scenario, now, tick, rng)
+
+        while launched < launching and now >= launched * settings.bot_launch_interval:
+            state.set_enabled(everyone, np.full(trials, launched), True)
+            state.launch(everyone, np.full(trials, launched), now, scenario, rng)
+            launched += 1
+
+        if now >= launch_complete:
+            if int(now) % 60 in SLOT_MAINTENANCE_SECONDS:
+                ensure_team_balance(state, scenario, settings, now)
+                ensure_reserved_slots(state, scenario, settings, now)
+            # Maintenance is skipped if the previous run is still in progress
+            if int(now) % BOT_MAINTENANCE_INTERVAL == 0:
+                state.cursor[state.cursor < 0] = 0
+            maintain_bots(state, scenario, settings, now, rng)
+
+        bots_on_server = state.bots_by_team.sum(axis=1)
+        filled = bots_on_server >= state.current_slots
+        time_to_fill[np.isnan(time_to_fill) & (bots_on_server >= scenario.slots)] = now
+        filled_time += np.where(filled, tick, 0)
+
+        # Track how long bots occupy slots which should be available to players
+        blocking = bots_on_server > get_available_slots(state, scenario)
+        released = ~blocking & ~np.isnan(release_pending_since)
+        release_latencies.append(now - release_pending_since[released])
+        release_pending_since[released] = np.nan
+        release_pending_since[blocking & np.isnan(release_pending_since)] = now
+
+    return Results(
+        time_to_fill=time_to_fill,
+        launches=state.launches,
+        kills=state.kills,
+        slot_release_latency=np.concatenate(release_latencies),
+        fill_ratio=filled_time / (duration + tick),
+        duration=duration
+    )
@@ -0,0 +1,57 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from scripts.types import ServerConfig
+
+
+@dataclass
+class ManagerSettings:
+    # Defaults as per src/config.ts
+    overpopulate_factor: int = 2
+    bot_launch_interval: float = 15
+    bot_join_timeout: float = 300
+    bot_on_server_timeout: float = 180
+    bot_slot_timeout: float = 60
+    reserved_slot_timeout: float = 240
+    autobalance_max_duration: float = 240
+
+    def dump(self) -> dict:
+        return {
+            'overpopulateFactor': self.overpopulate_factor,
+            'botLaunchInterval': self.bot_launch_interval,
+            'botJoinTimeout': self.bot_join_timeout,
+            'botOnServerTimeout': self.bot_on_server_timeout,
+            'botSlotTimeout': self.bot_slot_timeout,
+            'reservedSlotTimeout': self.reserved_slot_timeout,
+            'autobalanceMaxDuration': self.autobalance_max_duration
+        }
+
+
+@dataclass
+class Scenario:
+    slots: int
+    reserved_slots: int
+    bots: int
+    autobalance: bool = True
+    max_players: int = 64
+    # Probability of a launched bot never making it onto the server
+    join_failure_probability: float = 0.1
+    # Seconds it takes a bot to join the server after being launched (uniformly distributed)
+    join_delay_min: float = 30
+    join_delay_max: float = 90
+    # Probability of a bot dropping off the server (e.g. due to a crash or kick) within any given minute
+    drop_out_probability: float = 0.01
+    # Average number of real players joining per minute and the average minutes they stay for
+    player_arrival_rate: float = 0.2
+    player_session_length: float = 30
+
+    @staticmethod
+    def from_config(config: ServerConfig, bots: Optional[int] = None, **kwargs) -> 'Scenario':
+        return Scenario(
+            slots=config.slots,
+            reserved_slots=config.reserved_slots,
+            bots=bots if bots is not None else len(config.bots),
+            # Explicitly check for False here, since default (None) means autobalance is enabled
+            autobalance=config.autobalance is not False,
+            **kwargs
+        )
@@ -29,7 +29,7 @@ class BotConfig {
         this.server = server;
         this.password = password;
         
-        this.nickname = server.rotateBotNames === false ? basename : getBotName(basename);
+        this.nickname = server.rotateBotNames === false ? basename : getBotName(basename, undefined, server.botNameSuffixes);
         this.cwd = path.join(Config.RUNNING_DIR, this.server.name, String(this.slot));
         this.cdKey = generateCdkey();
     }
@@ -78,7 +78,7 @@ class BotConfig {
             return;
         }
 
-        this.nickname = getBotName(this.basename, this.nickname);
+        this.nickname = getBotName(this.basename, this.nickname, this.server.botNameSuffixes);
         if (writeXml) {
             return this.writeXml();
         }
@@ -7,6 +7,7 @@ export type BotServer = {
     queryPort?: number
     mod: string
     rotateBotNames?: boolean
+    botNameSuffixes?: number
 }
 
 export type ServerBotConfig = BotServer & {
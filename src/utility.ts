@@ -19,13 +19,16 @@ export function generateCdkey(): string {
     return elements.join('-');
 }
 
-export function getBotName(basename: string, currentName?: string): string {
-    const numbers = Array.from({ length: 16 }, (x, i) => i);
+export function getBotName(basename: string, currentName?: string, suffixes = 16): string {
+    const numbers = Array.from({ length: suffixes }, (x, i) => i);
 
-    if (currentName) {
-        const currentNumber = Number(currentName.split('^').pop());
+    // Switch to a different suffix, unless there is no other one to switch to
+    if (currentName && numbers.length > 1) {
+        const currentNumber = parseInt(currentName.split('^').pop() ?? '', 16);
         const index = numbers.indexOf(currentNumber);
-        numbers.splice(index, 1);
+        if (index != -1) {
+            numbers.splice(index, 1);
+        }
     }
 
     const newNumber = numbers[Math.floor(Math.random() * numbers.length)];